@@ -0,0 +1,42 @@
+"""PDE 数值核心: 不依赖 Streamlit 的求解器包
+
+子模块:
+    stencil, tridiagonal, workspace   -- 差分模板、三对角求解、时间层缓冲
+    heat, wave, quantum, adaptive     -- 热/波动/薛定谔方程的时间推进与自适应步长
+    multigrid, fast_poisson, sparse_ops, cavity -- 椭圆型问题与顶盖驱动方腔流
+    sweep, dataset, trajectory        -- 批量参数扫描、代理模型数据集、轨迹录制
+    bench, convergence                -- 基准测试与精度-代价收敛研究 (命令行: python -m pde_core.bench)
+    cache                             -- 求解结果的持久化磁盘缓存 (多进程共享, LRU 淘汰)
+    render, stream                    -- 动画帧的快速渲染; 求解线程与界面取帧的解耦 (有界队列)
+    animation                         -- 预计算动画: 量化帧数据与自包含的 HTML/JS 播放器
+    zoo                               -- 方程博物馆的演示计算与绘图 (matplotlib 延迟导入)
+    llm, llm_mock                     -- AI 助教回答 (openai 延迟导入, 客户端池, 流式输出); 本地模拟服务
+    answer_cache                      -- AI 助教回答的持久化缓存 (规范化 + 近似匹配, TTL 与 LRU)
+
+`import pde_core` 只导入 NumPy; 子模块在首次访问时才加载, SciPy 仅由需要稀疏/FFT
+求解的子模块在导入时引入。因此批处理 worker 与命令行工具无需启动 UI 栈。
+"""
+import importlib
+
+import numpy as np  # noqa: F401  (包的唯一硬依赖)
+
+_SUBMODULES = (
+    "adaptive", "animation", "answer_cache", "bench", "cache", "cavity", "convergence", "dataset",
+    "fast_poisson", "heat", "llm", "llm_mock", "multigrid", "quantum", "render", "sparse_ops", "stencil",
+    "stream", "sweep", "trajectory", "tridiagonal", "wave", "workspace", "zoo",
+)
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name):
+    # PEP 562: pde_core.heat 之类的属性访问在首次使用时才导入对应子模块
+    if name in _SUBMODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
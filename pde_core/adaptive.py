@@ -0,0 +1,123 @@
+"""带嵌入式误差控制的自适应时间步长
+
+- step_doubling: 步长倍增 (Richardson 误差估计), 适用于隐式单步格式 (热传导的 CN / 向后 Euler / ADI)。
+  每次尝试用步长 dt 走一步、用 dt/2 走两步, 两者之差除以 2^p - 1 即为局部误差估计 (p 为格式阶数),
+  接受两次半步的结果。隐式格式没有稳定性限制, 解变光滑后步长可以远大于显式格式的稳定步长。
+- rk23: Bogacki-Shampine 3(2) 嵌入式 Runge-Kutta 对 (与 MATLAB ode23 相同), 适用于非刚性的
+  线方法 (method of lines) 半离散系统, 如波动方程。
+
+两者都是生成器, 每接受一步产生 (t, dt, u), u 为内部状态数组 (下一步会被覆盖, 需要保留时请复制)。
+fixed_steps 以同样的接口包装固定步长的推进函数, 便于调用方用同一个循环处理两种情况。
+误差采用加权均方根范数 ‖e / (atol + rtol·max(|u_old|, |u_new|))‖_rms, 不超过 1 时接受。
+info 字典 (可选) 中累计 "accepted" / "rejected" 步数。
+"""
+import numpy as np
+
+from .workspace import Workspace
+
+# 步长调整系数的安全因子与上下限
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 5.0
+
+
+def error_norm(err, u_old, u_new, rtol, atol, work=None):
+    """加权均方根误差范数; work 为与 err 同形状的临时数组 (可选)"""
+    scale = np.maximum(np.abs(u_old, out=work), np.abs(u_new), out=work)
+    scale *= rtol
+    scale += atol
+    np.divide(err, scale, out=scale)
+    return float(np.sqrt(np.mean(np.square(scale, out=scale))))
+
+
+def step_factor(err, order):
+    """误差为 err 时下一步步长的缩放系数, order 为误差估计的阶数 (误差 ∝ dt^(order+1))"""
+    if err == 0.0:
+        return MAX_FACTOR
+    return min(MAX_FACTOR, max(MIN_FACTOR, SAFETY * err ** (-1.0 / (order + 1))))
+
+
+def fixed_steps(step, ws, dt, steps):
+    """固定步长推进 steps 步, 每步产生 (t, dt, u); step 为作用于 ws 的推进函数"""
+    for n in range(steps):
+        yield (n + 1) * dt, dt, step(ws)
+
+
+def step_doubling(make_stepper, u0, t_end, order, dt0, rtol=1e-3, atol=1e-6, dt_max=np.inf, info=None):
+    """用步长倍增控制误差, 把 u0 推进到 t_end
+
+    make_stepper(dt) 返回作用于 workspace.Workspace 的推进函数 step(ws) (见 heat.make_heat_*_stepper),
+    order 为格式的时间精度阶数, dt0 为初始试探步长。
+    """
+    u = np.array(u0, dtype=float)
+    ws_full, ws_half = Workspace(u), Workspace(u)
+    err_buf, work = np.empty_like(u), np.empty_like(u)
+    info = {} if info is None else info
+    info.update(accepted=0, rejected=0)
+    t, dt = 0.0, dt0
+    while t_end - t > 1e-12 * t_end:
+        dt = min(dt, dt_max, t_end - t)
+        ws_full.current[...] = u
+        full = make_stepper(dt)(ws_full)
+        ws_half.current[...] = u
+        half_step = make_stepper(0.5 * dt)
+        half_step(ws_half)
+        half = half_step(ws_half)
+
+        np.subtract(half, full, out=err_buf)
+        err_buf /= 2**order - 1
+        err = error_norm(err_buf, u, half, rtol, atol, work)
+        if err <= 1.0:
+            u[...] = half
+            t += dt
+            info["accepted"] += 1
+            yield t, dt, u
+        else:
+            info["rejected"] += 1
+        dt *= step_factor(err, order)
+
+
+def rk23(f, y0, t_end, dt0, rtol=1e-3, atol=1e-6, dt_max=np.inf, info=None):
+    """Bogacki-Shampine 3(2) 嵌入式 Runge-Kutta, 求解 y' = f(t, y), y(0) = y0, 直到 t_end
+
+    f(t, y, out) 把导数写入 out (就地, 不返回新数组)。各级导数数组只分配一次,
+    且利用 FSAL 性质 (最后一级即下一步的第一级), 每个接受的步只需 3 次 f 求值。
+    """
+    y = np.array(y0, dtype=float)
+    k1, k2, k3, k4 = (np.empty_like(y) for _ in range(4))
+    y_stage, y_new, err_buf, work = (np.empty_like(y) for _ in range(4))
+    info = {} if info is None else info
+    info.update(accepted=0, rejected=0)
+    f(0.0, y, k1)
+    t, dt = 0.0, dt0
+    while t_end - t > 1e-12 * t_end:
+        dt = min(dt, dt_max, t_end - t)
+        np.multiply(k1, 0.5 * dt, out=y_stage)
+        y_stage += y
+        f(t + 0.5 * dt, y_stage, k2)
+        np.multiply(k2, 0.75 * dt, out=y_stage)
+        y_stage += y
+        f(t + 0.75 * dt, y_stage, k3)
+
+        # 三阶解 y_new = y + dt (2/9 k1 + 1/3 k2 + 4/9 k3)
+        np.multiply(k1, 2 / 9 * dt, out=y_new)
+        y_new += np.multiply(k2, dt / 3, out=y_stage)
+        y_new += np.multiply(k3, 4 / 9 * dt, out=y_stage)
+        y_new += y
+        f(t + dt, y_new, k4)
+
+        # 与二阶解之差: dt (-5/72 k1 + 1/12 k2 + 1/9 k3 - 1/8 k4)
+        np.multiply(k1, -5 / 72 * dt, out=err_buf)
+        err_buf += np.multiply(k2, dt / 12, out=y_stage)
+        err_buf += np.multiply(k3, dt / 9, out=y_stage)
+        err_buf -= np.multiply(k4, dt / 8, out=y_stage)
+        err = error_norm(err_buf, y, y_new, rtol, atol, work)
+        if err <= 1.0:
+            y, y_new = y_new, y
+            k1, k4 = k4, k1
+            t += dt
+            info["accepted"] += 1
+            yield t, dt, y
+        else:
+            info["rejected"] += 1
+        dt *= step_factor(err, 2)
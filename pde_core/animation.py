@@ -0,0 +1,238 @@
+"""预计算动画: 一次算出全部帧, 量化后打包为自包含的 HTML/JS 播放器
+
+播放、暂停与拖动进度条都在浏览器中完成, 回放不再让服务器重新计算。缓存的是帧数据 (不是 HTML),
+按 (求解器名, 参数, 代码版本) 存入 cache.ResultCache, 同样的参数再次请求时直接读取:
+    "t"                 各帧的时间 (帧数,)
+    一维曲线  "x"       各显示列的横坐标; "ylim" 纵轴范围
+              "lo"/"hi" 每列中 u 的最小 / 最大值按 ylim 量化的 uint8 (帧数, 列数);
+                        网格点数不超过 max_points 时每个格点一列, lo == hi
+    二维热图  "png"     各帧的调色板 PNG (见 render.HeatmapFrames) 首尾相接的字节 (uint8),
+                        "offsets" 为各帧在其中的起止位置 (帧数 + 1,); "vrange" 颜色范围
+帧按物理时间等间隔选取 (自适应步长同样适用), 终态总是最后一帧。
+
+    arrays = heat_2d_animation(128, 128, 0.2, "中心热源", "dirichlet", steps=300)
+    html = heatmap_player_html(arrays, title="2D heat")
+"""
+import base64
+import html
+import json
+from string import Template
+
+import numpy as np
+
+from .adaptive import fixed_steps
+from .heat import (
+    explicit_stable_dt, explicit_stable_dt_2d, make_heat_1d_stepper, make_heat_2d_stepper,
+    apply_boundary_2d, heat_1d_adaptive, heat_2d_adaptive,
+)
+from .render import HeatmapFrames, colorbar_png, quantize
+from .workspace import Workspace
+from .zoo import initial_condition_1d, initial_condition_2d
+
+DEFAULT_FRAMES = 100
+PLAYER_FPS = 20
+LEVELS = 256   # 一维曲线的量化级数 (uint8)
+
+
+# ==========================================
+# 帧的采集与编码
+# ==========================================
+
+def sample_frames(march, u0, t_end, n_frames, encode):
+    """从 (t, dt, u) 推进中按物理时间等间隔取约 n_frames 帧 (另加初始帧与终态), 返回 (times, [encode(u)])
+
+    encode(u) 必须返回新对象 (u 是工作区缓冲); 初始帧在推进开始前编码, u0 随后可被工作区改写。
+    """
+    times, frames = [0.0], [encode(u0)]
+    last = 0
+    t, u = 0.0, u0
+    for t, _, u in march:
+        k = int(t / t_end * n_frames * (1 + 1e-9))
+        if k > last:
+            last = k
+            times.append(t)
+            frames.append(encode(u))
+    if times[-1] != t:
+        times.append(t)
+        frames.append(encode(u))
+    return np.array(times), frames
+
+
+def line_encoder(x, ylim, max_points=1000):
+    """一维曲线的编码器: 返回 (各列横坐标, encode), encode(u) -> (lo, hi) 两个 uint8 数组
+
+    网格点数超过 max_points 时按 max_points // 2 列分箱, 每列保留最小 / 最大值 (与 render.decimate_minmax
+    相同的保峰抽样), 播放器在每列画一条竖线, 峰值不会丢失。
+    """
+    n = len(x)
+    if n <= max_points:
+        def encode(u):
+            q = quantize(u, *ylim, n=LEVELS)
+            return q, q
+        return np.asarray(x, dtype=float), encode
+    bins = max_points // 2
+    per = -(-n // bins)
+    pad = bins * per - n
+    columns = np.pad(x, (0, pad), mode="edge").reshape(bins, per).mean(axis=1)
+
+    def encode(u):
+        binned = np.pad(u, (0, pad), mode="edge").reshape(bins, per)
+        return quantize(binned.min(axis=1), *ylim, n=LEVELS), quantize(binned.max(axis=1), *ylim, n=LEVELS)
+    return columns, encode
+
+
+def line_arrays(march, x, u0, t_end, ylim, n_frames=DEFAULT_FRAMES, max_points=1000):
+    """一维曲线动画的帧数据 (见模块说明)"""
+    columns, encode = line_encoder(x, ylim, max_points)
+    times, frames = sample_frames(march, u0, t_end, n_frames, encode)
+    return {"t": times, "x": columns, "ylim": np.array(ylim, dtype=float),
+            "lo": np.array([lo for lo, _ in frames]), "hi": np.array([hi for _, hi in frames])}
+
+
+def heatmap_arrays(march, u0, t_end, vrange, cmap="hot", n_frames=DEFAULT_FRAMES):
+    """二维热图动画的帧数据: 每帧经颜色查找表量化后编码为调色板 PNG (见模块说明)"""
+    frames = HeatmapFrames(u0.shape, *vrange, cmap=cmap)
+    times, pngs = sample_frames(march, u0, t_end, n_frames, frames.png)
+    offsets = np.cumsum([0] + [len(png) for png in pngs])
+    return {"t": times, "png": np.frombuffer(b"".join(pngs), dtype=np.uint8), "offsets": offsets,
+            "vrange": np.array(vrange, dtype=float)}
+
+
+# ==========================================
+# 热传导演示 (与界面的 run_1d_simulation / run_2d_simulation 相同的参数)
+# ==========================================
+
+def heat_1d_animation(alpha, steps, initial_cond, scheme="explicit", dt=None, nx=100, rtol=1e-3,
+                      n_frames=DEFAULT_FRAMES, ylim=(0.0, 1.1)):
+    """一维热传导: steps 个 dt (dt 为 None 时取显式稳定步长; 自适应时推进到相同的物理时间) 的动画帧数据"""
+    dx = 1.0 / (nx - 1)
+    if dt is None:
+        dt = explicit_stable_dt(alpha, dx)
+    x = np.linspace(0, 1, nx)
+    u = initial_condition_1d(initial_cond, x)
+    t_end = steps * dt
+    if scheme == "adaptive":
+        march = heat_1d_adaptive(u, alpha, dx, t_end, rtol=rtol)
+    else:
+        march = fixed_steps(make_heat_1d_stepper(nx, alpha * dt / dx**2, scheme), Workspace(u), dt, steps)
+    return line_arrays(march, x, u, t_end, ylim, n_frames)
+
+
+def heat_2d_animation(N, M, alpha, initial_temp_type, boundary, steps, scheme="explicit", dt=None, rtol=1e-3,
+                      n_frames=DEFAULT_FRAMES, vrange=(0.0, 100.0)):
+    """二维热传导: 参数含义同界面的 run_2d_simulation (boundary 为 heat.BOUNDARY_TYPES 之一)"""
+    dx, dy = 1.0 / (N - 1), 1.0 / (M - 1)
+    if dt is None:
+        dt = explicit_stable_dt_2d(alpha, dx, dy)
+    u = initial_condition_2d(initial_temp_type, N, M)
+    apply_boundary_2d(u, boundary)
+    t_end = steps * dt
+    if scheme == "adaptive":
+        march = heat_2d_adaptive(u, alpha, dx, dy, t_end, boundary, rtol=rtol)
+    else:
+        march = fixed_steps(make_heat_2d_stepper(u.shape, alpha, dt, dx, dy, boundary, scheme),
+                            Workspace(u), dt, steps)
+    return heatmap_arrays(march, u, t_end, vrange, n_frames=n_frames)
+
+
+# ==========================================
+# HTML/JS 播放器
+# ==========================================
+
+_PLAYER = Template("""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><style>
+body { margin: 0; font-family: sans-serif; font-size: 14px; }
+#view { display: flex; align-items: center; gap: 8px; }
+#frame { image-rendering: pixelated; }
+#controls { display: flex; align-items: center; gap: 8px; margin-top: 6px; max-width: ${width}px; }
+#scrub { flex: 1; }
+</style></head><body>
+<div>${title}</div>
+<div id="view">${view}</div>
+<div id="controls"><button id="play"></button><input id="scrub" type="range" min="0" value="0">
+<span id="label"></span></div>
+<script>
+const data = ${data};
+const n = data.t.length;
+${setup}
+const scrub = document.getElementById("scrub"), label = document.getElementById("label");
+const play = document.getElementById("play");
+let frame = 0, timer = null;
+scrub.max = n - 1;
+function show(i) {
+  frame = i;
+  scrub.value = i;
+  draw(i);
+  label.textContent = "t = " + data.t[i].toPrecision(4) + "  (" + (i + 1) + "/" + n + ")";
+}
+function setPlaying(on) {
+  clearInterval(timer);
+  timer = on ? setInterval(() => show((frame + 1) % n), 1000 / data.fps) : null;
+  play.textContent = on ? "\\u275a\\u275a" : "\\u25b6";
+}
+play.onclick = () => setPlaying(timer === null);
+scrub.oninput = () => { setPlaying(false); show(+scrub.value); };
+show(0);
+setPlaying(true);
+</script></body></html>
+""")
+
+_LINE_SETUP = """
+const decode = s => Uint8Array.from(atob(s), c => c.charCodeAt(0));
+const lo = decode(data.lo), hi = decode(data.hi), m = data.x.length;
+const canvas = document.getElementById("frame"), ctx = canvas.getContext("2d");
+const W = canvas.width, H = canvas.height, pad = 36;
+const x0 = data.x[0], x1 = data.x[m - 1];
+const px = x => pad + (x - x0) / (x1 - x0) * (W - 2 * pad);
+const py = q => H - pad - (q + 0.5) / 256 * (H - 2 * pad);
+function draw(i) {
+  ctx.clearRect(0, 0, W, H);
+  ctx.strokeStyle = "#bbb";
+  ctx.strokeRect(pad, pad, W - 2 * pad, H - 2 * pad);
+  ctx.fillStyle = "#444";
+  ctx.fillText(data.ylim[1], 4, pad + 4);
+  ctx.fillText(data.ylim[0], 4, H - pad);
+  ctx.fillText(data.xlabel, W / 2, H - 8);
+  ctx.strokeStyle = data.color;
+  ctx.beginPath();
+  for (let k = 0, j = i * m; k < m; k++, j++) {
+    const X = px(data.x[k]);
+    if (k === 0) ctx.moveTo(X, py(lo[j])); else ctx.lineTo(X, py(lo[j]));
+    if (hi[j] !== lo[j]) ctx.lineTo(X, py(hi[j]));
+  }
+  ctx.stroke();
+}
+"""
+
+_IMAGE_SETUP = """
+const img = document.getElementById("frame");
+function draw(i) { img.src = "data:image/png;base64," + data.frames[i]; }
+"""
+
+
+def _b64(data):
+    return base64.b64encode(bytes(data)).decode("ascii")
+
+
+def _player_html(title, view, setup, data, width):
+    return _PLAYER.substitute(title=html.escape(title), view=view, setup=setup, width=width,
+                              data=json.dumps(data, separators=(",", ":")))
+
+
+def line_player_html(arrays, title="", xlabel="x", color="red", width=720, height=320, fps=PLAYER_FPS):
+    """一维曲线动画 (line_arrays 的帧数据) 的自包含 HTML 播放器, 曲线在 <canvas> 上绘制"""
+    data = {"t": arrays["t"].tolist(), "x": np.round(arrays["x"], 6).tolist(), "ylim": arrays["ylim"].tolist(),
+            "lo": _b64(arrays["lo"]), "hi": _b64(arrays["hi"]), "fps": fps, "xlabel": xlabel, "color": color}
+    view = f'<canvas id="frame" width="{width}" height="{height}"></canvas>'
+    return _player_html(title, view, _LINE_SETUP, data, width)
+
+
+def heatmap_player_html(arrays, title="", cmap="hot", label="", display_px=480, fps=PLAYER_FPS):
+    """二维热图动画 (heatmap_arrays 的帧数据) 的自包含 HTML 播放器, 小网格在浏览器中按像素放大"""
+    png, offsets = arrays["png"], arrays["offsets"]
+    frames = [_b64(png[a:b]) for a, b in zip(offsets[:-1], offsets[1:])]
+    colorbar = _b64(colorbar_png(*arrays["vrange"], cmap=cmap, label=label))
+    view = (f'<img id="frame" width="{display_px}">'
+            f'<img src="data:image/png;base64,{colorbar}" style="height: {display_px}px">')
+    return _player_html(title, view, _IMAGE_SETUP, {"t": arrays["t"].tolist(), "frames": frames, "fps": fps},
+                        display_px + 120)
@@ -0,0 +1,195 @@
+"""AI 助教回答的持久化缓存 (SQLite, 多个服务进程共享)
+
+键 = SHA-256(模型名, system 提示词, 规范化的问题)。规范化: NFKC (全角转半角)、转小写、去掉标点与空白,
+因此 "什么是有限差分算法？" 与 "什么是有限差分算法" 命中同一条目; 数学符号、数字与公式中常用的
+ASCII 标点 (MATH_PUNCTUATION) 保留, "u_t = u_xx + f" 与 "u_t = u_xx - f" 是不同的问题。
+    - 条目超过 ttl 秒后视为过期 (不返回, 淘汰时删除)
+    - 条目数超过 max_entries 时按最近使用时间 (LRU) 删除最旧的条目
+    - similarity > 0 时 (默认关闭), 精确键未命中后在同一模型与提示词的条目中按字符 n-gram 的 Jaccard 相似度
+      查找近似重复的问题, 不低于 similarity 的最相似条目视为命中 ("请问什么是有限差分算法" 命中
+      "什么是有限差分算法")。changes_meaning 排除会改变问题含义的差异: 替换了字 ("显式" / "隐式")、
+      增删否定词 (NEGATIONS, 如多一个 "不") 或增删数字、字母与公式符号
+命中 / 近似命中 / 未命中的次数写入数据库, 所有进程累计, 供运维查看 (stats, 或命令行)。
+SQLite 使用 WAL 模式, 每次操作单独连接, 可在多个线程与进程中同时使用。
+
+命令行: python -m pde_core.answer_cache [--path cache/answers.sqlite3] [--purge] [--clear]
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+import unicodedata
+from collections import Counter, namedtuple
+from contextlib import closing, contextmanager
+
+NGRAM = 2   # 中文问题以字为单位, 按字的二元组比较语序
+# 规范化时保留的标点 (Unicode 类别 P 中在公式里有含义的字符, 如减号、下标、括号)
+MATH_PUNCTUATION = frozenset("-_*/%()[]{}'")
+# 增删后会把问题变为反问或否定的字
+NEGATIONS = frozenset("不非无没未否别勿")
+
+CachedAnswer = namedtuple("CachedAnswer", "answer similarity prompt")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY, model TEXT, system TEXT, normalized TEXT, prompt TEXT, answer TEXT,
+    created REAL, last_used REAL, hits INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS answers_scope ON answers (model, system, created);
+CREATE INDEX IF NOT EXISTS answers_lru ON answers (last_used);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER);
+"""
+COUNTERS = ("hits", "near_hits", "misses", "stores", "evictions")
+
+
+def normalize_prompt(prompt):
+    """问题的规范形式: NFKC、小写, 去掉空白与标点 (MATH_PUNCTUATION 除外), 保留符号与数字"""
+    text = unicodedata.normalize("NFKC", prompt).lower()
+    return "".join(ch for ch in text if not ch.isspace() and unicodedata.category(ch)[0] != "Z"
+                   and (unicodedata.category(ch)[0] != "P" or ch in MATH_PUNCTUATION))
+
+
+def ngrams(text, n=NGRAM):
+    """字符 n-gram 集合 (文本短于 n 时为整个文本)"""
+    return {text[i:i + n] for i in range(max(1, len(text) - n + 1))}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def changes_meaning(a, b):
+    """两个规范化问题的差异是否可能改变含义: 有字被替换, 或增删的字中含否定词、数字、字母或符号
+
+    只增删其他字 (如 "请问"、"呢"、"的") 时返回 False。
+    """
+    only_a, only_b = Counter(a) - Counter(b), Counter(b) - Counter(a)
+    if only_a and only_b:
+        return True
+    # 类别 Lo 为汉字等表意文字; 其余 (数字、拉丁字母、数学符号) 都是问题的内容
+    return any(ch in NEGATIONS or unicodedata.category(ch) != "Lo" for ch in only_a or only_b)
+
+
+def answer_key(model, system, normalized):
+    return hashlib.sha256("\0".join((model, system, normalized)).encode()).hexdigest()
+
+
+class AnswerCache:
+    """path 处的回答缓存; ttl 为条目有效期 (秒), similarity 为近似匹配阈值 (0 表示只做精确匹配)"""
+
+    def __init__(self, path, ttl=7 * 24 * 3600, max_entries=5000, similarity=0.0):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+            db.executemany("INSERT OR IGNORE INTO counters VALUES (?, 0)", [(name,) for name in COUNTERS])
+
+    @contextmanager
+    def _connect(self):
+        """一次操作的连接: 正常退出时提交, 异常时回滚, 总是关闭"""
+        with closing(sqlite3.connect(self.path, timeout=30.0)) as db:
+            with db:
+                yield db
+
+    def get(self, model, system, prompt):
+        """返回 CachedAnswer (similarity 为 1.0 表示精确命中) 或 None"""
+        normalized = normalize_prompt(prompt)
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute("SELECT key, answer, prompt FROM answers WHERE key = ? AND created > ?",
+                             (answer_key(model, system, normalized), now - self.ttl)).fetchone()
+            similarity = 1.0
+            if row is None and self.similarity > 0:
+                row, similarity = self._nearest(db, model, system, normalized, now)
+            if row is None:
+                _count(db, "misses")
+                return None
+            db.execute("UPDATE answers SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, row[0]))
+            _count(db, "hits" if similarity == 1.0 else "near_hits")
+            return CachedAnswer(row[1], similarity, row[2])
+
+    def _nearest(self, db, model, system, normalized, now):
+        """同一模型与提示词的未过期条目中, n-gram 相似度最高且不低于阈值、差异不改变含义的条目"""
+        target = ngrams(normalized)
+        best, best_score = None, self.similarity
+        rows = db.execute("SELECT key, answer, prompt, normalized FROM answers "
+                          "WHERE model = ? AND system = ? AND created > ?", (model, system, now - self.ttl))
+        for key, answer, prompt, other in rows:
+            # Jaccard 相似度不超过 短 / 长 的长度比, 长度相差过大时不必计算
+            if min(len(other), len(normalized)) < best_score * max(len(other), len(normalized)) - NGRAM:
+                continue
+            score = jaccard(target, ngrams(other))
+            if score >= best_score and not changes_meaning(normalized, other):
+                best, best_score = (key, answer, prompt), score
+        return best, best_score
+
+    def put(self, model, system, prompt, answer):
+        """写入 (或刷新) 条目, 然后淘汰过期与超出容量的条目"""
+        normalized = normalize_prompt(prompt)
+        now = time.time()
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO answers (key, model, system, normalized, prompt, answer, created, "
+                       "last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       (answer_key(model, system, normalized), model, system, normalized, prompt, answer, now, now))
+            _count(db, "stores")
+            self._evict(db, now)
+
+    def _evict(self, db, now):
+        removed = db.execute("DELETE FROM answers WHERE created <= ?", (now - self.ttl,)).rowcount
+        excess = db.execute("SELECT COUNT(*) FROM answers").fetchone()[0] - self.max_entries
+        if excess > 0:
+            removed += db.execute("DELETE FROM answers WHERE key IN "
+                                  "(SELECT key FROM answers ORDER BY last_used LIMIT ?)", (excess,)).rowcount
+        if removed:
+            _count(db, "evictions", removed)
+        return removed
+
+    def purge(self):
+        """删除过期与超出容量的条目, 返回删除的条目数"""
+        with self._connect() as db:
+            return self._evict(db, time.time())
+
+    def clear(self):
+        with self._connect() as db:
+            db.execute("DELETE FROM answers")
+            db.execute("UPDATE counters SET value = 0")
+
+    def stats(self):
+        """所有进程累计的计数 (hits / near_hits / misses / stores / evictions) 与当前条目数、命中率"""
+        with self._connect() as db:
+            stats = dict(db.execute("SELECT name, value FROM counters"))
+            stats["entries"] = db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        lookups = stats["hits"] + stats["near_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["near_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+def _count(db, name, n=1):
+    db.execute("UPDATE counters SET value = value + ? WHERE name = ?", (n, name))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI 助教回答缓存的统计与维护")
+    parser.add_argument("--path", default=os.path.join(os.environ.get("PDE_CACHE_DIR", "cache"), "answers.sqlite3"))
+    parser.add_argument("--ttl-hours", type=float, default=168.0, help="条目有效期 (--purge 使用)")
+    parser.add_argument("--max-entries", type=int, default=5000, help="条目数上限 (--purge 使用)")
+    parser.add_argument("--purge", action="store_true", help="删除过期与超出容量的条目")
+    parser.add_argument("--clear", action="store_true", help="删除全部条目并清零计数")
+    args = parser.parse_args(argv)
+
+    cache = AnswerCache(args.path, ttl=args.ttl_hours * 3600, max_entries=args.max_entries)
+    if args.clear:
+        cache.clear()
+    elif args.purge:
+        print(f"删除 {cache.purge()} 条")
+    for name, value in cache.stats().items():
+        print(f"{name:>10}  {value:.1%}" if name == "hit_rate" else f"{name:>10}  {value}")
+
+
+if __name__ == "__main__":
+    main()
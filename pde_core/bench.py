@@ -0,0 +1,339 @@
+"""求解器基准测试: 分别计时计算阶段与绘图阶段, 结果以 JSON 输出便于跨提交对比
+
+每个用例 (case) 对应界面中的一个求解器, 在一组网格尺寸 (及时间步数) 上运行:
+    compute   纯数值计算 (与界面相同的求解器调用), 重复 repeat 次, 报告中位数 / p95 耗时
+    plot      渲染一帧与界面相同的 matplotlib 图并编码为 PNG (即 st.pyplot 的工作), 单独计时
+    memory    另跑一次计算, 用 tracemalloc 统计 NumPy 数组等分配的峰值字节数 (不影响计时)
+cell_updates 为一次计算的格点更新次数: 时间推进为 格点数 x 步数, 迭代求解为 格点数 x 迭代次数,
+直接解法 (DST、稀疏 LU 回代) 记为 格点数。计时前先预热一次, 因此按网格缓存的分解/层次结构
+(lru_cache) 已建立, 测得的是界面中重复运行时的稳态耗时。
+
+命令行: python -m pde_core.bench [--cases heat_1d/explicit,heat_2d/adi] [--sizes 64,128]
+                                 [--steps 100] [--repeat 5] [--no-plot] [--json out.json]
+                                 [--baseline old.json]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .adaptive import fixed_steps
+from .cavity import solve_cavity, cavity_velocity
+from .heat import (
+    explicit_stable_dt, explicit_stable_dt_2d, make_heat_1d_stepper, make_heat_2d_stepper,
+    apply_boundary_2d, heat_1d_adaptive, heat_2d_adaptive,
+)
+from .multigrid import solve_poisson_multigrid
+from .quantum import square_well_potential, make_schrodinger_cn_stepper
+from .sparse_ops import solve_helmholtz
+from .stencil import apply_dirichlet_1d, apply_dirichlet_2d
+from .workspace import Workspace
+from .zoo import solve_steady_state
+
+
+# ==========================================
+# 用例: 每个 setup(n, steps) 返回 (compute, plot, steps)
+#   compute() -> (结果, cell_updates); plot(fig, 结果) 在给定 Figure 上绘制一帧
+# ==========================================
+
+def _setup_heat_1d(scheme, n, steps):
+    """run_1d_simulation: 高斯脉冲初值, α = 0.01, 显式稳定步长 (adaptive 推进到相同的物理时间)"""
+    alpha = 0.01
+    dx = 1.0 / (n - 1)
+    dt = explicit_stable_dt(alpha, dx)
+    x = np.linspace(0, 1, n)
+    u0 = np.exp(-100 * (x - 0.5)**2)
+    apply_dirichlet_1d(u0)
+
+    def compute():
+        if scheme == "adaptive":
+            march = heat_1d_adaptive(u0, alpha, dx, steps * dt)
+        else:
+            march = fixed_steps(make_heat_1d_stepper(n, alpha * dt / dx**2, scheme), Workspace(u0.copy()), dt, steps)
+        taken = 0
+        for taken, (t, _, u) in enumerate(march, 1):
+            pass
+        return u, n * taken
+
+    def plot(fig, u):
+        ax = fig.add_subplot()
+        ax.plot(x, u, color='red', label='u')
+        ax.set_ylim(0, 1.1)
+        ax.grid(True)
+        ax.legend()
+
+    return compute, plot, steps
+
+
+def _setup_heat_2d(scheme, n, steps):
+    """run_2d_simulation: 中心热源, 固定温度边界, α = 0.01, 显式稳定步长"""
+    alpha = 0.01
+    dx = dy = 1.0 / (n - 1)
+    dt = explicit_stable_dt_2d(alpha, dx, dy)
+    u0 = np.zeros((n, n))
+    u0[n//2 - n//10:n//2 + n//10, n//2 - n//10:n//2 + n//10] = 100.0
+    apply_boundary_2d(u0, "dirichlet")
+
+    def compute():
+        if scheme == "adaptive":
+            march = heat_2d_adaptive(u0, alpha, dx, dy, steps * dt, "dirichlet")
+        else:
+            stepper = make_heat_2d_stepper(u0.shape, alpha, dt, dx, dy, "dirichlet", scheme)
+            march = fixed_steps(stepper, Workspace(u0.copy()), dt, steps)
+        taken = 0
+        for taken, (t, _, u) in enumerate(march, 1):
+            pass
+        return u, n * n * taken
+
+    def plot(fig, u):
+        from matplotlib.colors import Normalize
+        ax = fig.add_subplot()
+        im = ax.imshow(u.T, origin='lower', cmap='hot', norm=Normalize(vmin=0, vmax=100))
+        fig.colorbar(im, ax=ax, label='Temperature')
+
+    return compute, plot, steps
+
+
+def _setup_steady(problem, solver, n, steps):
+    """simulate_laplace / simulate_poisson: 网格单位下的 -ΔT = f (Jacobi 固定 steps 次迭代)"""
+    T0 = np.zeros((n, n))
+    if problem == "laplace":
+        apply_dirichlet_2d(T0, top=100)
+        f = None
+    else:
+        f = np.zeros((n, n))
+        f[n//3, n//3], f[2*n//3, 2*n//3] = 100, -100
+
+    def compute():
+        if solver == "multigrid":
+            T, info = solve_poisson_multigrid(T0, f, h=1.0, tol=1e-8)
+            return T, n * n * info["iterations"]
+        T, _ = solve_steady_state(T0.copy(), f, solver, 1e-8, jacobi_sweeps=steps)
+        return T, n * n * (steps if solver == "jacobi" else 1)
+
+    def plot(fig, T):
+        ax = fig.add_subplot()
+        c = ax.contourf(T, cmap='hot' if problem == "laplace" else 'seismic', levels=20)
+        fig.colorbar(c, ax=ax)
+
+    return compute, plot, steps if solver == "jacobi" else None
+
+
+def _setup_helmholtz(n, steps):
+    """simulate_helmholtz: 中心点源, k = 5, Dirichlet 边界 (LU 分解按网格缓存, 计时为回代)"""
+    b = np.zeros((n, n))
+    b.flat[n * n // 2] = 1.0
+
+    def compute():
+        return solve_helmholtz(b, 5.0, "dirichlet"), n * n
+
+    def plot(fig, u):
+        ax = fig.add_subplot()
+        c = ax.contourf(u, cmap='plasma', levels=20)
+        fig.colorbar(c, ax=ax)
+
+    return compute, plot, None
+
+
+def _setup_cavity(n, steps):
+    """simulate_navier_stokes_cavity: Re = 10, Newton 法求稳态"""
+    def compute():
+        psi, omega, info = solve_cavity(n, 10.0, method="newton", tol=1e-6)
+        return psi, n * n * info["iterations"]
+
+    def plot(fig, psi):
+        u, v = cavity_velocity(psi)
+        grid = np.linspace(0, 1, n)
+        X, Y = np.meshgrid(grid, grid)
+        fig.add_subplot().streamplot(X, Y, u, v, density=1.5, color=psi, cmap='coolwarm')
+
+    return compute, plot, None
+
+
+def _setup_schrodinger(n, steps):
+    """simulate_schrodinger: 方势阱中的高斯波包, Crank-Nicolson, dt = 0.01"""
+    x, V = square_well_potential(n, 100.0)
+    dx = x[1] - x[0]
+    psi0 = np.exp(-(x / 5.0)**2) * np.exp(1j * x)
+    apply_dirichlet_1d(psi0)
+
+    def compute():
+        step = make_schrodinger_cn_stepper(V, dx, 0.01)
+        ws = Workspace(psi0.copy())
+        for _ in range(steps):
+            psi = step(ws)
+        return psi, n * steps
+
+    def plot(fig, psi):
+        ax = fig.add_subplot()
+        ax.plot(x, np.abs(psi)**2)
+        ax.plot(x, V * 0.05, linestyle='--')
+
+    return compute, plot, steps
+
+
+def _case(setup, *args):
+    return lambda n, steps: setup(*args, n, steps)
+
+
+# 用例名 -> (setup, 默认网格尺寸, 默认步数)
+CASES = {
+    "heat_1d/explicit": (_case(_setup_heat_1d, "explicit"), (100, 1000, 10000), 1000),
+    "heat_1d/crank_nicolson": (_case(_setup_heat_1d, "crank_nicolson"), (100, 1000, 10000), 1000),
+    "heat_1d/implicit": (_case(_setup_heat_1d, "implicit"), (100, 1000, 10000), 1000),
+    "heat_1d/adaptive": (_case(_setup_heat_1d, "adaptive"), (100, 1000), 1000),
+    "heat_2d/explicit": (_case(_setup_heat_2d, "explicit"), (64, 128, 256), 100),
+    "heat_2d/adi": (_case(_setup_heat_2d, "adi"), (64, 128, 256), 100),
+    "heat_2d/adaptive": (_case(_setup_heat_2d, "adaptive"), (64, 128), 100),
+    "laplace/multigrid": (_case(_setup_steady, "laplace", "multigrid"), (65, 129, 257), None),
+    "laplace/dst": (_case(_setup_steady, "laplace", "dst"), (65, 129, 257), None),
+    "laplace/jacobi": (_case(_setup_steady, "laplace", "jacobi"), (50, 100), 500),
+    "poisson/multigrid": (_case(_setup_steady, "poisson", "multigrid"), (65, 129, 257), None),
+    "poisson/dst": (_case(_setup_steady, "poisson", "dst"), (65, 129, 257), None),
+    "helmholtz": (_setup_helmholtz, (50, 100, 200), None),
+    "cavity": (_setup_cavity, (33, 65), None),
+    "schrodinger": (_setup_schrodinger, (100, 1000, 10000), 50),
+}
+
+
+# ==========================================
+# 计时与报告
+# ==========================================
+
+def _percentiles(samples):
+    samples = np.asarray(samples)
+    return float(np.median(samples)), float(np.percentile(samples, 95))
+
+
+def _render_png(plot, result):
+    """与 st.pyplot 相同: 新建 Figure, 绘制并编码为 PNG (Agg 后端, 不弹出窗口)"""
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(8, 4))
+    plot(fig, result)
+    fig.savefig(io.BytesIO(), format="png")
+
+
+def run_case(name, n, steps=None, repeat=5, plot=True):
+    """运行一个用例的一组 (n, steps), 返回结果字典 (时间单位为秒, 内存单位为字节)"""
+    setup = CASES[name][0]
+    compute, plot_frame, steps = setup(n, steps if steps is not None else CASES[name][2])
+
+    result, cell_updates = compute()   # 预热: 建立按网格缓存的分解, 触发延迟导入
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result, cell_updates = compute()
+        times.append(time.perf_counter() - t)
+    median, p95 = _percentiles(times)
+
+    tracemalloc.start()
+    compute()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    row = {
+        "case": name, "n": n, "steps": steps, "repeat": repeat,
+        "median_s": median, "p95_s": p95, "times_s": times,
+        "cell_updates": int(cell_updates), "cell_updates_per_s": cell_updates / max(median, 1e-12),
+        "peak_bytes": int(peak),
+    }
+    if plot:
+        _render_png(plot_frame, result)
+        plot_times = []
+        for _ in range(repeat):
+            t = time.perf_counter()
+            _render_png(plot_frame, result)
+            plot_times.append(time.perf_counter() - t)
+        row["plot_median_s"], row["plot_p95_s"] = _percentiles(plot_times)
+    return row
+
+
+def run_benchmarks(cases=None, sizes=None, steps=None, repeat=5, plot=True, report=None):
+    """在每个用例的网格尺寸 x 步数组合上运行基准测试, 返回 {"meta": ..., "results": [...]}
+
+    cases: 用例名列表 (默认全部, 见 CASES); sizes / steps: 覆盖各用例的默认网格尺寸 / 步数 (序列);
+    report: 可选回调 report(row), 每完成一组调用一次。
+    """
+    results = []
+    for name in cases or CASES:
+        if name not in CASES:
+            raise ValueError(f"未知的用例: {name} (可选: {', '.join(CASES)})")
+        _, default_sizes, default_steps = CASES[name]
+        for n in sizes or default_sizes:
+            for s in (steps if steps and default_steps is not None else (default_steps,)):
+                row = run_case(name, n, s, repeat, plot)
+                results.append(row)
+                if report is not None:
+                    report(row)
+    return {"meta": _environment(), "results": results}
+
+
+def _environment():
+    """运行环境与代码版本, 写入 JSON 以便跨提交对比时核对"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    import scipy
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+        "scipy": scipy.__version__, "platform": platform.platform(), "cpus": os.cpu_count(),
+    }
+
+
+def format_row(row, baseline=None):
+    """一行文本报告; baseline 为旧结果中同一 (case, n, steps) 的行时附加加速比"""
+    steps = "" if row["steps"] is None else f" x {row['steps']}"
+    text = (f"{row['case']:<24} {str(row['n']) + steps:>14}  median {row['median_s'] * 1e3:9.2f} ms"
+            f"  p95 {row['p95_s'] * 1e3:9.2f} ms  {row['cell_updates_per_s']:9.3g} upd/s"
+            f"  peak {row['peak_bytes'] / 2**20:7.1f} MiB")
+    if "plot_median_s" in row:
+        text += f"  plot {row['plot_median_s'] * 1e3:7.1f} ms"
+    if baseline is not None:
+        text += f"  x{baseline['median_s'] / max(row['median_s'], 1e-12):.2f} vs baseline"
+    return text
+
+
+def _baseline_index(path):
+    with open(path, encoding="utf-8") as f:
+        return {(r["case"], r["n"], r["steps"]): r for r in json.load(f)["results"]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="求解器基准测试 (计算与绘图分开计时, JSON 输出)")
+    parser.add_argument("--cases", default=None, help="逗号分隔的用例名 (默认全部): " + ", ".join(CASES))
+    parser.add_argument("--sizes", default=None, help="逗号分隔的网格尺寸, 覆盖各用例的默认值")
+    parser.add_argument("--steps", default=None, help="逗号分隔的时间步数 / Jacobi 迭代次数, 覆盖默认值")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-plot", action="store_true", help="只计时计算阶段")
+    parser.add_argument("--json", default=None, help="结果 JSON 的输出路径 ('-' 为标准输出)")
+    parser.add_argument("--baseline", default=None, help="旧的结果 JSON, 报告相对加速比")
+    args = parser.parse_args()
+
+    def ints(text):
+        return [int(v) for v in text.split(",")] if text else None
+
+    baseline = _baseline_index(args.baseline) if args.baseline else {}
+    log = sys.stderr if args.json == "-" else sys.stdout
+
+    def report(row):
+        print(format_row(row, baseline.get((row["case"], row["n"], row["steps"]))), file=log, flush=True)
+
+    out = run_benchmarks(args.cases.split(",") if args.cases else None, ints(args.sizes), ints(args.steps),
+                         args.repeat, not args.no_plot, report)
+    if args.json == "-":
+        json.dump(out, sys.stdout, indent=1)
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=1)
+        print(f"结果已写入 {args.json}", file=log)
@@ -0,0 +1,280 @@
+"""求解结果的持久化磁盘缓存 (内容寻址, 按大小做 LRU 淘汰, 可由多个进程共享)
+
+键 = SHA-256(求解器名, 规范化的参数 JSON, 代码版本), 代码版本为 pde_core 全部源文件内容的哈希,
+修改任何数值代码后旧条目自然失效 (随后被 LRU 淘汰)。每个条目是一个 .npz 文件:
+    解数组 (按名称), 可选的 "__figure__" (渲染好的 PNG 字节, uint8) 与 "__meta__" (JSON 文本)
+
+多进程安全 (同一主机上的多个 Streamlit 服务进程共享一个目录):
+    - 写入先落到带进程号的临时文件, 再 os.replace 原子替换, 读者只会看到完整的条目
+    - 同一个键的计算由锁文件 (fcntl.flock) 串行化, 并发的相同请求只计算一次, 其余等待后直接读取;
+      锁按键的前两位十六进制数分为 256 个条带 (不同的键偶尔共用一把锁), 锁目录中的文件数不随条目增长
+    - 命中时更新文件的 mtime, LRU 淘汰按 mtime 从旧到新删除, 直到总大小不超过 max_bytes;
+      淘汰由全局锁保护, 其他进程正在淘汰时直接跳过
+    - 同一进程内 (多个会话线程 / 后台预热线程) 正在计算的键登记在进程级的 in-flight 表中,
+      后来的请求等待同一个 Future, 不会重复计算
+没有 fcntl 的平台 (Windows) 上不加跨进程锁, 仍然保证不会读到半写的条目, 只是不同进程的相同请求可能重复计算。
+
+warm_up 在后台线程中把一批作业提交到进程池预先计算 (例如服务启动时的方程博物馆默认演示),
+调用立即返回; 预热完成前的同名请求会加入正在进行的计算。
+"""
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+
+CACHE_FORMAT = 1
+FIGURE_KEY = "__figure__"
+META_KEY = "__meta__"
+# 与 st.pyplot 默认的 savefig 参数一致, 缓存的 PNG 与直接显示的图外观相同
+FIGURE_SAVEFIG_KWARGS = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+
+# 本进程内正在计算的条目: (缓存目录, 键) -> Future
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """pde_core 源代码的内容哈希 (每个进程计算一次)"""
+    package = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(f"format {CACHE_FORMAT}".encode())
+    for name in sorted(os.listdir(package)):
+        if name.endswith(".py"):
+            with open(os.path.join(package, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+    return digest.hexdigest()[:16]
+
+
+def cache_key(solver, params, version=None):
+    """求解器名 + 参数 + 代码版本的内容哈希; params 需可序列化为 JSON (NumPy 标量/数组会被转换)"""
+    payload = json.dumps({"solver": solver, "params": params, "code": version or code_version()},
+                         sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def figure_png(fig):
+    """把 matplotlib Figure 渲染为 PNG 字节"""
+    buf = io.BytesIO()
+    fig.savefig(buf, **FIGURE_SAVEFIG_KWARGS)
+    return buf.getvalue()
+
+
+class ResultCache:
+    """目录 root 下的结果缓存, 总大小超过 max_bytes 时按最近使用时间淘汰
+
+    get_or_compute 返回 (arrays, figure_png); hits / misses / joins 为本实例的命中 / 未命中 /
+    加入进行中计算的次数。
+    """
+
+    def __init__(self, root, max_bytes=512 * 2**20):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.joins = 0
+        os.makedirs(os.path.join(root, "locks"), exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.npz")
+
+    def get(self, key):
+        """读取条目, 返回 (arrays, figure_png, meta); 不存在 (或已被其他进程淘汰) 时返回 None"""
+        path = self.path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files if name not in (FIGURE_KEY, META_KEY)}
+                figure = data[FIGURE_KEY].tobytes() if FIGURE_KEY in data.files else None
+                meta = json.loads(str(data[META_KEY])) if META_KEY in data.files else {}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+            # 损坏或截断的条目 (例如写入过程中磁盘已满): 删除后视为未命中
+            _remove(path)
+            return None
+        try:
+            os.utime(path)   # LRU: 命中即刷新最近使用时间
+        except FileNotFoundError:
+            pass
+        return arrays, figure, meta
+
+    def put(self, key, arrays=None, figure=None, **meta):
+        """写入条目 (原子替换), 然后按需淘汰; figure 可为 PNG 字节或 matplotlib Figure"""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = dict(arrays or {})
+        if figure is not None:
+            if not isinstance(figure, (bytes, bytearray)):
+                figure = figure_png(figure)
+            entry[FIGURE_KEY] = np.frombuffer(figure, dtype=np.uint8)
+        entry[META_KEY] = np.array(json.dumps(meta, ensure_ascii=False, default=_json_default))
+        tmp = f"{path[:-4]}.{os.getpid()}.tmp.npz"
+        try:
+            np.savez(tmp, **entry)
+            os.replace(tmp, path)
+        finally:
+            _remove(tmp)
+        self.evict()
+
+    def get_or_compute(self, solver, params, compute):
+        """命中时直接返回 (arrays, figure_png); 否则调用 compute() -> (arrays, figure) 并写入缓存
+
+        同一个键在多个进程 / 线程中同时未命中时只有一个调用 compute, 其余等待它写入后读取。
+        """
+        key = cache_key(solver, params)
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[0], entry[1]
+
+        inflight = (os.path.abspath(self.root), key)
+        with _INFLIGHT_LOCK:
+            future = _INFLIGHT.get(inflight)
+            owner = future is None
+            if owner:
+                future = _INFLIGHT[inflight] = Future()
+        if not owner:
+            self.joins += 1
+            return future.result()
+        try:
+            result = self._compute_locked(key, solver, params, compute)
+            future.set_result(result)
+            return result
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with _INFLIGHT_LOCK:
+                del _INFLIGHT[inflight]
+
+    def _compute_locked(self, key, solver, params, compute):
+        """持有该键所在条带的跨进程锁计算并写入; 等锁期间其他进程可能已经写好, 此时直接读取"""
+        with self._lock(f"compute_{key[:2]}.lock"):
+            entry = self.get(key)
+            if entry is not None:
+                self.joins += 1
+                return entry[0], entry[1]
+            self.misses += 1
+            arrays, figure = compute()
+            if figure is not None and not isinstance(figure, (bytes, bytearray)):
+                figure = figure_png(figure)
+            self.put(key, arrays, figure, solver=solver, params=params, code=code_version())
+            return arrays or {}, figure
+
+    def entries(self):
+        """所有条目的 (路径, 大小, mtime), 按 mtime 从旧到新排序"""
+        found = []
+        for sub in os.listdir(self.root):
+            directory = os.path.join(self.root, sub)
+            if sub == "locks" or not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if not name.endswith(".npz") or ".tmp." in name:
+                    continue
+                try:
+                    stat = os.stat(os.path.join(directory, name))
+                except FileNotFoundError:
+                    continue
+                found.append((os.path.join(directory, name), stat.st_size, stat.st_mtime))
+        found.sort(key=lambda e: e[2])
+        return found
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """删除最久未使用的条目直到总大小不超过 max_bytes, 返回删除的条目数"""
+        with self._lock("evict.lock", blocking=False) as acquired:
+            if not acquired:
+                return 0   # 其他进程正在淘汰
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for path, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                _remove(path)
+                total -= size
+                removed += 1
+            return removed
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            _remove(path)
+
+    @contextmanager
+    def _lock(self, name, blocking=True):
+        """锁目录中的文件锁 (fcntl.flock); 非阻塞模式下未取得锁时产生 False"""
+        if fcntl is None:
+            yield True
+            return
+        with open(os.path.join(self.root, "locks", name), "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def warm_up(cache, jobs, workers=None):
+    """在后台预先计算 jobs = [(solver, params, fn, args), ...] 并写入 cache, 立即返回 Future 列表
+
+    fn(*args) -> (arrays, figure) 在进程池 (workers 个进程) 中执行, 不占用调用进程的 GIL; 工作进程由 forkserver
+    (没有时为 spawn) 启动, 不从多线程的服务进程 fork (子进程可能继承其他线程持有的锁而死锁);
+    每个作业由一个后台线程经 cache.get_or_compute 提交, 因此已缓存的作业直接跳过,
+    预热期间同一进程中对同一键的请求会等待这次计算而不是重复计算。Future 的结果为 (arrays, figure_png)。
+    """
+    if not jobs:
+        return []
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+    threads = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="cache-warm-up")
+
+    def run(solver, params, fn, args):
+        return cache.get_or_compute(solver, params, lambda: pool.submit(fn, *args).result())
+
+    futures = [threads.submit(run, *job) for job in jobs]
+    remaining = [len(futures)]
+    remaining_lock = threading.Lock()
+
+    def finished(_):
+        with remaining_lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                pool.shutdown(wait=False)
+
+    for future in futures:
+        future.add_done_callback(finished)
+    threads.shutdown(wait=False)
+    return futures
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _json_default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"无法写入 JSON: {type(obj)}")
@@ -0,0 +1,285 @@
+"""精度-代价验证: 用解析解 / 构造解检验各离散格式的收敛阶与单位 CPU 时间的精度
+
+问题与参考解 (误差均为网格上的最大模误差 ‖u_h - u‖_∞):
+    heat_1d    u_t = α u_xx, u(x, 0) = sin πx + ½ sin 3πx, 两端为 0 -> Fourier 级数逐项衰减
+    heat_2d    u_t = α Δu, u(x, y, 0) = sin πx sin πy, 边界为 0 -> 单个 Fourier 模态衰减
+    wave_1d    u_tt = c² u_xx, 高斯初始位移、零初速度、两端固定 -> d'Alembert 解 (初值的奇周期延拓)
+    poisson    -Δu = f, 构造解 u = sin πx sin 2πy + x² y (边界值非零), f = 5π² sin πx sin 2πy - 2y
+每个格式在一串逐次加密的网格上运行, 时间步长按格式固定地随网格缩放 (显式热传导 dt ∝ h²,
+其余 dt ∝ h; 自适应格式取 rtol ∝ h²)。观测阶 p = log(e_i / e_{i+1}) / log(h_i / h_{i+1}) 是随 h
+一起加密时的整体阶。Pareto 表把所有 (格式, 网格) 按 CPU 时间排序, 标出不被其他点同时在误差与
+耗时上支配的点; 给定目标误差时可直接选出满足要求的最便宜方案。
+
+命令行: python -m pde_core.convergence [--problems heat_1d,poisson] [--target 1e-4] [--json out.json]
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from .adaptive import fixed_steps
+from .fast_poisson import solve_poisson_dst
+from .heat import (
+    explicit_stable_dt, explicit_stable_dt_2d, make_heat_1d_stepper, make_heat_2d_stepper,
+    heat_1d_adaptive,
+)
+from .multigrid import solve_poisson_multigrid
+from .stencil import jacobi_step_2d
+from .wave import wave_stable_dt, make_wave_1d_stepper, start_leapfrog, wave_1d_adaptive
+from .workspace import Workspace
+
+
+# ==========================================
+# 参考解
+# ==========================================
+
+HEAT_1D_MODES = ((1, 1.0), (3, 0.5))   # (k, b_k): u(x, 0) = Σ b_k sin kπx
+
+
+def heat_1d_exact(x, t, alpha):
+    """一维热传导的 Fourier 级数解 Σ b_k exp(-α (kπ)² t) sin kπx"""
+    return sum(b * np.exp(-alpha * (k * np.pi)**2 * t) * np.sin(k * np.pi * x) for k, b in HEAT_1D_MODES)
+
+
+def heat_2d_exact(x, y, t, alpha):
+    """二维热传导的单模态解 exp(-2π² α t) sin πx sin πy"""
+    return np.exp(-2 * np.pi**2 * alpha * t) * np.outer(np.sin(np.pi * x), np.sin(np.pi * y))
+
+
+def wave_initial(x):
+    """波动方程的初始位移 (中心高斯脉冲, 两端值约 1e-11, 视为 0)"""
+    return np.exp(-100 * (x - 0.5)**2)
+
+
+def wave_1d_exact(x, t, c, L=1.0):
+    """d'Alembert 解 ½[F(x - ct) + F(x + ct)], F 为初始位移在 [-L, L] 上的奇延拓再以 2L 为周期延拓"""
+    def F(s):
+        s = np.mod(s + L, 2 * L) - L
+        return np.sign(s) * wave_initial(np.abs(s))
+    return 0.5 * (F(x - c * t) + F(x + c * t))
+
+
+def poisson_exact(x, y):
+    """泊松方程的构造解 u = sin πx sin 2πy + x² y 及其源项 f = -Δu, 返回 (u, f)"""
+    X, Y = np.meshgrid(x, y, indexing="ij")
+    smooth = np.sin(np.pi * X) * np.sin(2 * np.pi * Y)
+    return smooth + X**2 * Y, 5 * np.pi**2 * smooth - 2 * Y
+
+
+# ==========================================
+# 各格式在网格尺寸 n 上的一次求解: 返回 (误差, h, dt, 步数/迭代次数)
+# ==========================================
+
+HEAT_ALPHA = 1.0
+HEAT_1D_T_END = 0.05
+HEAT_2D_T_END = 0.02
+WAVE_C = 1.0
+WAVE_T_END = 0.3
+IMPLICIT_DT_PER_H = 0.1   # 隐式 / CN / ADI 的 dt = 0.1 h (无稳定性限制, 与 h 同阶加密)
+
+
+def _steps_for(t_end, dt):
+    """不超过 dt 且恰好整除 t_end 的步长及步数"""
+    steps = int(np.ceil(t_end / dt - 1e-9))
+    return t_end / steps, steps
+
+
+def _run_heat_1d(scheme, n):
+    h = 1.0 / (n - 1)
+    x = np.linspace(0, 1, n)
+    u0 = heat_1d_exact(x, 0.0, HEAT_ALPHA)
+    if scheme == "adaptive":
+        info = {}
+        for t, dt, u in heat_1d_adaptive(u0, HEAT_ALPHA, h, HEAT_1D_T_END, rtol=h**2, atol=1e-3 * h**2, info=info):
+            pass
+        return np.abs(u - heat_1d_exact(x, HEAT_1D_T_END, HEAT_ALPHA)).max(), h, None, info["accepted"]
+    dt = explicit_stable_dt(HEAT_ALPHA, h) if scheme == "explicit" else IMPLICIT_DT_PER_H * h
+    dt, steps = _steps_for(HEAT_1D_T_END, dt)
+    step = make_heat_1d_stepper(n, HEAT_ALPHA * dt / h**2, scheme)
+    for t, _, u in fixed_steps(step, Workspace(u0), dt, steps):
+        pass
+    return np.abs(u - heat_1d_exact(x, HEAT_1D_T_END, HEAT_ALPHA)).max(), h, dt, steps
+
+
+def _run_heat_2d(scheme, n):
+    h = 1.0 / (n - 1)
+    x = np.linspace(0, 1, n)
+    u0 = heat_2d_exact(x, x, 0.0, HEAT_ALPHA)
+    dt = explicit_stable_dt_2d(HEAT_ALPHA, h, h) if scheme == "explicit" else IMPLICIT_DT_PER_H * h
+    dt, steps = _steps_for(HEAT_2D_T_END, dt)
+    step = make_heat_2d_stepper(u0.shape, HEAT_ALPHA, dt, h, h, "dirichlet", scheme)
+    for t, _, u in fixed_steps(step, Workspace(u0), dt, steps):
+        pass
+    return np.abs(u - heat_2d_exact(x, x, HEAT_2D_T_END, HEAT_ALPHA)).max(), h, dt, steps
+
+
+def _run_wave_1d(scheme, n):
+    h = 1.0 / (n - 1)
+    x = np.linspace(0, 1, n)
+    u0 = wave_initial(x)
+    u0[0] = u0[-1] = 0.0
+    if scheme == "rk23":
+        info = {}
+        for t, dt, u in wave_1d_adaptive(u0, WAVE_C, h, WAVE_T_END, rtol=h**2, atol=1e-3 * h**2, info=info):
+            pass
+        return np.abs(u - wave_1d_exact(x, WAVE_T_END, WAVE_C)).max(), h, None, info["accepted"]
+    dt, steps = _steps_for(WAVE_T_END, wave_stable_dt(WAVE_C, h))
+    r = WAVE_C * dt / h
+    ws = Workspace(u0, levels=3)
+    start_leapfrog(ws, r)
+    step = make_wave_1d_stepper(r)
+    for _ in range(steps):
+        u = step(ws)
+    return np.abs(u - wave_1d_exact(x, WAVE_T_END, WAVE_C)).max(), h, dt, steps
+
+
+POISSON_JACOBI_SWEEPS = 500
+
+
+def _run_poisson(solver, n):
+    h = 1.0 / (n - 1)
+    x = np.linspace(0, 1, n)
+    exact, f = poisson_exact(x, x)
+    u0 = exact.copy()
+    u0[1:-1, 1:-1] = 0.0   # 边界取精确值, 内部从零开始
+    if solver == "multigrid":
+        u, info = solve_poisson_multigrid(u0, f, h=h, tol=1e-10)
+        iterations = info["iterations"]
+    elif solver == "dst":
+        u, iterations = solve_poisson_dst(u0, f, dx=h), 1
+    else:
+        u, iterations = u0, POISSON_JACOBI_SWEEPS
+        f_grid = f * h**2   # jacobi_step_2d 按网格单位 (dx = 1) 处理源项
+        for _ in range(iterations):
+            u = jacobi_step_2d(u, rhs=f_grid)
+    return np.abs(u - exact).max(), h, None, iterations
+
+
+def _scheme(run, scheme):
+    return lambda n: run(scheme, n)
+
+
+# 问题名 -> ({格式名: run(n)}, 网格尺寸序列)
+PROBLEMS = {
+    "heat_1d": ({
+        "explicit": _scheme(_run_heat_1d, "explicit"),
+        "implicit": _scheme(_run_heat_1d, "implicit"),
+        "crank_nicolson": _scheme(_run_heat_1d, "crank_nicolson"),
+        "adaptive (rtol = h²)": _scheme(_run_heat_1d, "adaptive"),
+    }, (11, 21, 41, 81, 161)),
+    "heat_2d": ({
+        "explicit": _scheme(_run_heat_2d, "explicit"),
+        "adi": _scheme(_run_heat_2d, "adi"),
+    }, (9, 17, 33, 65)),
+    "wave_1d": ({
+        "leapfrog": _scheme(_run_wave_1d, "leapfrog"),
+        "rk23 (rtol = h²)": _scheme(_run_wave_1d, "rk23"),
+    }, (51, 101, 201, 401)),
+    "poisson": ({
+        "multigrid": _scheme(_run_poisson, "multigrid"),
+        "dst": _scheme(_run_poisson, "dst"),
+        f"jacobi ({POISSON_JACOBI_SWEEPS} sweeps)": _scheme(_run_poisson, "jacobi"),
+    }, (17, 33, 65, 129)),
+}
+
+
+# ==========================================
+# 收敛研究与报告
+# ==========================================
+
+def convergence_study(problem, schemes=None, sizes=None):
+    """在逐次加密的网格上运行问题 problem 的各格式, 返回结果行列表
+
+    每行: {"problem", "scheme", "n", "h", "dt", "steps", "error", "cpu_s", "order"};
+    order 为与上一个 (较粗) 网格相比的观测阶, 第一行为 None。cpu_s 为进程 CPU 时间。
+    """
+    runners, default_sizes = PROBLEMS[problem]
+    rows = []
+    for scheme in schemes or runners:
+        run = runners[scheme]
+        run(default_sizes[0])   # 预热: 延迟导入与按网格缓存的分解不计入第一行
+        previous = None
+        for n in sizes or default_sizes:
+            t = time.process_time()
+            error, h, dt, steps = run(n)
+            cpu = time.process_time() - t
+            error = float(error)
+            order = None
+            if previous is not None and error > 0 and previous["error"] > 0:
+                order = float(np.log(previous["error"] / error) / np.log(previous["h"] / h))
+            row = {"problem": problem, "scheme": scheme, "n": n, "h": h, "dt": dt, "steps": steps,
+                   "error": error, "cpu_s": cpu, "order": order}
+            rows.append(row)
+            previous = row
+    return rows
+
+
+PARETO_RTOL = 1e-3
+
+
+def pareto_front(rows):
+    """按 CPU 时间排序, 标记 Pareto 最优行 (没有其他行同时更快且误差更小), 返回新的行列表
+
+    误差只比更快的行小不到 PARETO_RTOL (相对) 时视为持平, 不算最优 (例如收敛到同一离散解的两个求解器)。
+    """
+    front = []
+    best_error = np.inf
+    for row in sorted(rows, key=lambda r: (r["cpu_s"], r["error"])):
+        optimal = row["error"] < best_error * (1 - PARETO_RTOL)
+        best_error = min(best_error, row["error"])
+        front.append(dict(row, pareto=optimal))
+    return front
+
+
+def cheapest_meeting(rows, target):
+    """误差不超过 target 的行中 CPU 时间最少的一行, 没有则返回 None"""
+    feasible = [r for r in rows if r["error"] <= target]
+    return min(feasible, key=lambda r: r["cpu_s"]) if feasible else None
+
+
+def format_order_table(rows):
+    lines = [f"{'scheme':<24} {'n':>6} {'dt':>10} {'steps':>7} {'error':>10} {'order':>6} {'cpu s':>9}"]
+    for r in rows:
+        dt = "-" if r["dt"] is None else f"{r['dt']:.2e}"   # 自适应格式与稳态求解器没有固定的 dt
+        order = "" if r["order"] is None else f"{r['order']:.2f}"
+        lines.append(f"{r['scheme']:<24} {r['n']:>6} {dt:>10} {r['steps']:>7} {r['error']:>10.2e} "
+                     f"{order:>6} {r['cpu_s']:>9.4f}")
+    return "\n".join(lines)
+
+
+def format_pareto_table(rows):
+    lines = [f"{'':1} {'scheme':<24} {'n':>6} {'error':>10} {'cpu s':>9} {'error x cpu s':>14}"]
+    for r in pareto_front(rows):
+        lines.append(f"{'*' if r['pareto'] else ' '} {r['scheme']:<24} {r['n']:>6} {r['error']:>10.2e} "
+                     f"{r['cpu_s']:>9.4f} {r['error'] * r['cpu_s']:>14.2e}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="各离散格式的收敛阶与精度-代价 (Pareto) 表")
+    parser.add_argument("--problems", default=None, help="逗号分隔的问题名 (默认全部): " + ", ".join(PROBLEMS))
+    parser.add_argument("--sizes", default=None, help="逗号分隔的网格尺寸, 覆盖各问题的默认值")
+    parser.add_argument("--target", type=float, default=None, help="目标误差: 报告满足要求的最便宜方案")
+    parser.add_argument("--json", default=None, help="结果 JSON 的输出路径 ('-' 为标准输出)")
+    args = parser.parse_args()
+
+    log = sys.stderr if args.json == "-" else sys.stdout
+    sizes = [int(v) for v in args.sizes.split(",")] if args.sizes else None
+    results = []
+    for problem in args.problems.split(",") if args.problems else PROBLEMS:
+        rows = convergence_study(problem, sizes=sizes)
+        results.extend(rows)
+        print(f"\n=== {problem}: 收敛阶 ===\n{format_order_table(rows)}", file=log)
+        print(f"\n=== {problem}: 误差 vs CPU 时间 (* = Pareto 最优) ===\n{format_pareto_table(rows)}", file=log)
+        if args.target is not None:
+            best = cheapest_meeting(rows, args.target)
+            print(f"\n误差 <= {args.target:g} 的最便宜方案: " + (
+                f"{best['scheme']}, n = {best['n']} ({best['cpu_s']:.4f} s, 误差 {best['error']:.2e})"
+                if best else "无 (请加密网格)"), file=log)
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=1)
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1)
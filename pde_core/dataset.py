@@ -0,0 +1,201 @@
+"""代理模型 (Surrogate) 训练数据集生成: D = {(P_i, U_i)}, U_i 为二维热传导在 t_end 时刻的温度场
+
+参数 P = (α, cx, cy, width, amplitude): 扩散率与高斯热源的中心、宽度、幅值, 边界温度固定为 0。
+每个样本用 ADI 格式 (无条件稳定, 固定步数) 推进到 t_end。
+
+存储格式 (一个目录, 可断点续算):
+    meta.json            生成配置 (网格、样本数、分块大小、随机种子 ...)
+    chunk_00000.npz      params (c, 5) float64, fields (c, N, N) float32
+    ...
+每个分块由一个工作进程独立计算并直接写盘 (先写临时文件再原子重命名), 主进程只收集完成的分块序号,
+因此内存占用只与分块大小和进程数有关。分块 k 的参数由 (seed, k) 确定, 中断后重新运行只补齐缺失的分块,
+结果与一次性生成完全相同。
+
+命令行: python -m pde_core.dataset <目录> --samples 100000 --grid 64 [--workers N]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from .heat import make_heat_2d_stepper, apply_boundary_2d
+from .workspace import Workspace
+
+PARAM_NAMES = ("alpha", "cx", "cy", "width", "amplitude")
+# 各参数的均匀采样区间
+PARAM_RANGES = {
+    "alpha": (0.05, 1.0),
+    "cx": (0.2, 0.8),
+    "cy": (0.2, 0.8),
+    "width": (0.03, 0.15),
+    "amplitude": (10.0, 100.0),
+}
+
+
+def sample_heat_2d_params(rng, n):
+    """在 PARAM_RANGES 内均匀采样 n 组参数, 返回形状 (n, len(PARAM_NAMES)) 的数组"""
+    low = np.array([PARAM_RANGES[k][0] for k in PARAM_NAMES])
+    high = np.array([PARAM_RANGES[k][1] for k in PARAM_NAMES])
+    return rng.uniform(low, high, size=(n, len(PARAM_NAMES)))
+
+
+def solve_heat_2d_sample(params, N=64, t_end=0.05, steps=20):
+    """单个样本: 高斯热源初值, Dirichlet 0 边界, ADI 推进 steps 步到 t_end, 返回 (N, N) 温度场"""
+    alpha, cx, cy, width, amplitude = params
+    x = np.linspace(0, 1, N)
+    X, Y = np.meshgrid(x, x, indexing="ij")
+    u = amplitude * np.exp(-((X - cx)**2 + (Y - cy)**2) / (2 * width**2))
+    apply_boundary_2d(u, "dirichlet")
+    h = 1.0 / (N - 1)
+    step = make_heat_2d_stepper(u.shape, alpha, t_end / steps, h, h, "dirichlet", "adi")
+    ws = Workspace(u)
+    for _ in range(steps):
+        u = step(ws)
+    return u
+
+
+def process_context():
+    """工作进程的启动方式: forkserver (Linux / macOS), 不支持时为 spawn (Windows)"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def chunk_path(path, index):
+    return os.path.join(path, f"chunk_{index:05d}.npz")
+
+
+def dataset_progress(path):
+    """返回 (已完成分块数, 总分块数); 目录不存在时为 (0, 0)"""
+    meta = _read_meta(path)
+    if meta is None:
+        return 0, 0
+    n_chunks = _n_chunks(meta)
+    return sum(os.path.exists(chunk_path(path, k)) for k in range(n_chunks)), n_chunks
+
+
+def generate_dataset(path, n_samples, N=64, chunk_size=256, t_end=0.05, steps=20, seed=0,
+                     workers=None, progress=None):
+    """生成 (或续算) 数据集, 返回本次新计算的分块数
+
+    workers: 进程数, 默认为 CPU 核数; 为 1 时在当前进程内顺序计算。工作进程由 forkserver (没有时为 spawn) 启动,
+             不从调用方 fork: 在 Streamlit 这样的多线程服务中 fork 可能继承被其他线程持有的锁而死锁。
+    progress: 可选回调 progress(已完成分块数, 总分块数), 每完成一个分块调用一次。
+    目录中已有 meta.json 时配置必须一致, 否则抛出 ValueError。
+    """
+    meta = {"n_samples": int(n_samples), "N": int(N), "chunk_size": int(chunk_size),
+            "t_end": float(t_end), "steps": int(steps), "seed": int(seed),
+            "param_names": list(PARAM_NAMES), "param_ranges": {k: list(v) for k, v in PARAM_RANGES.items()}}
+    os.makedirs(path, exist_ok=True)
+    existing = _read_meta(path)
+    if existing is None:
+        _write_json(os.path.join(path, "meta.json"), meta)
+    elif existing != meta:
+        raise ValueError(f"目录 {path} 中已有不同配置的数据集, 请换一个目录")
+
+    n_chunks = _n_chunks(meta)
+    todo = [k for k in range(n_chunks) if not os.path.exists(chunk_path(path, k))]
+    done = n_chunks - len(todo)
+    if progress:
+        progress(done, n_chunks)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for k in todo:
+            _generate_chunk(path, k, meta)
+            done += 1
+            if progress:
+                progress(done, n_chunks)
+        return len(todo)
+
+    # 限制在途任务数, 避免一次提交上万个任务
+    with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as pool:
+        pending = set()
+        queue = iter(todo)
+        for k in queue:
+            pending.add(pool.submit(_generate_chunk, path, k, meta))
+            if len(pending) >= 2 * workers:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in finished:
+                    f.result()
+                    done += 1
+                    if progress:
+                        progress(done, n_chunks)
+        for f in wait(pending).done:
+            f.result()
+            done += 1
+            if progress:
+                progress(done, n_chunks)
+    return len(todo)
+
+
+def iter_dataset(path):
+    """按顺序逐块读取已完成的分块, 产生 (params, fields), 不会一次性把整个数据集读入内存"""
+    meta = _read_meta(path)
+    if meta is None:
+        return
+    for k in range(_n_chunks(meta)):
+        p = chunk_path(path, k)
+        if os.path.exists(p):
+            with np.load(p) as data:
+                yield data["params"], data["fields"]
+
+
+def _generate_chunk(path, index, meta):
+    """工作进程: 计算第 index 个分块并原子地写盘"""
+    start = index * meta["chunk_size"]
+    n = min(meta["chunk_size"], meta["n_samples"] - start)
+    params = sample_heat_2d_params(np.random.default_rng([meta["seed"], index]), n)
+    fields = np.empty((n, meta["N"], meta["N"]), dtype=np.float32)
+    for i, p in enumerate(params):
+        fields[i] = solve_heat_2d_sample(p, meta["N"], meta["t_end"], meta["steps"])
+    final = chunk_path(path, index)
+    tmp = f"{final[:-4]}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, params=params, fields=fields)
+    os.replace(tmp, final)
+    return index
+
+
+def _n_chunks(meta):
+    return -(-meta["n_samples"] // meta["chunk_size"])
+
+
+def _read_meta(path):
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_json(file, obj):
+    tmp = f"{file}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, file)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="生成二维热传导代理模型数据集 (可断点续算)")
+    parser.add_argument("path", help="输出目录")
+    parser.add_argument("--samples", type=int, default=10000)
+    parser.add_argument("--grid", type=int, default=64)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--t-end", type=float, default=0.05)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+
+    def report(done, total):
+        rate = done / max(time.perf_counter() - t0, 1e-9)
+        print(f"\r{done}/{total} 分块 ({rate:.2f} 块/秒)", end="", flush=True)
+
+    n = generate_dataset(args.path, args.samples, args.grid, args.chunk_size, args.t_end, args.steps,
+                         args.seed, args.workers, report)
+    print(f"\n本次计算 {n} 个分块, 耗时 {time.perf_counter() - t0:.1f} s")
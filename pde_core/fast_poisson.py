@@ -0,0 +1,88 @@
+"""基于离散正弦变换 (DST-I) 的矩形 Dirichlet 区域快速泊松求解器
+
+五点差分 -Δh 在齐次 Dirichlet 边界下被 DST-I 对角化, 特征值为
+    λ_pq = (2 - 2cos(pπ/(n+1))) / dx² + (2 - 2cos(qπ/(m+1))) / dy²
+因此 u = IDST(DST(f) / λ) 给出离散方程的精确解, 复杂度 O(N² log N), 无需迭代。
+非齐次边界值通过提升 (lifting) 处理: 已知的边界值移到右端项中。
+
+运行 python -m pde_core.fast_poisson 可打印 N = 50 ~ 2048 时 DST / 多重网格 / Jacobi 的耗时对比。
+"""
+import time
+from functools import lru_cache
+
+import numpy as np
+from scipy.fft import dstn, idstn
+
+
+def solve_poisson_dst(u0, f=None, dx=1.0, dy=None):
+    """直接求解 -Δu = f, u0 的边界值即 Dirichlet 边界条件 (内部值被忽略), 返回新数组 u
+
+    dx 对应第 0 维, dy 对应第 1 维 (默认 dy = dx), 可用于任意矩形区域。
+    """
+    if dy is None:
+        dy = dx
+    u = np.array(u0, dtype=float)
+    n, m = u.shape[0] - 2, u.shape[1] - 2
+    rhs = np.zeros((n, m)) if f is None else np.array(f[1:-1, 1:-1], dtype=float)
+
+    # 提升: 边界邻居项 u_b / h² 移到右端
+    rhs[0, :] += u[0, 1:-1] / dx**2
+    rhs[-1, :] += u[-1, 1:-1] / dx**2
+    rhs[:, 0] += u[1:-1, 0] / dy**2
+    rhs[:, -1] += u[1:-1, -1] / dy**2
+
+    coeffs = dstn(rhs, type=1, workers=-1)
+    coeffs /= _eigenvalues(n, m, float(dx), float(dy))
+    u[1:-1, 1:-1] = idstn(coeffs, type=1, workers=-1)
+    return u
+
+
+@lru_cache(maxsize=16)
+def _eigenvalues(n, m, dx, dy):
+    """-Δh 在 n x m 个内部点上的特征值表 λ_pq (按网格尺寸缓存)"""
+    lx = (2 - 2 * np.cos(np.pi * np.arange(1, n + 1) / (n + 1))) / dx**2
+    ly = (2 - 2 * np.cos(np.pi * np.arange(1, m + 1) / (m + 1))) / dy**2
+    return np.add.outer(lx, ly)
+
+
+def compare_timings(sizes=(50, 128, 256, 512, 1024, 2048), jacobi_sweeps=500):
+    """对比 DST 直接解法、多重网格 (tol=1e-8) 与固定次数 Jacobi 迭代的耗时, 返回结果列表"""
+    from .multigrid import solve_poisson_multigrid
+    from .stencil import jacobi_step_2d
+
+    rows = []
+    for N in sizes:
+        u0 = np.zeros((N, N))
+        u0[0, :] = 100
+        f = np.zeros((N, N))
+        f[N // 3, N // 3], f[2 * N // 3, 2 * N // 3] = 100, -100
+
+        t = time.perf_counter()
+        u_dst = solve_poisson_dst(u0, f)
+        t_dst = time.perf_counter() - t
+
+        t = time.perf_counter()
+        u_mg, info = solve_poisson_multigrid(u0, f, tol=1e-8)
+        t_mg = time.perf_counter() - t
+
+        t = time.perf_counter()
+        u_jac = u0.copy()
+        for _ in range(jacobi_sweeps):
+            u_jac = jacobi_step_2d(u_jac, rhs=f)
+        t_jac = time.perf_counter() - t
+
+        rows.append({
+            "N": N, "dst_s": t_dst, "multigrid_s": t_mg, "multigrid_cycles": info["iterations"],
+            "jacobi_s": t_jac,
+            "multigrid_err": float(np.abs(u_mg - u_dst).max()),
+            "jacobi_err": float(np.abs(u_jac - u_dst).max()),
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'N':>6} {'DST (s)':>10} {'MG (s)':>10} {'MG cycles':>10} {'Jacobi500 (s)':>14}"
+          f" {'|MG-DST|':>10} {'|Jac-DST|':>10}")
+    for r in compare_timings():
+        print(f"{r['N']:>6} {r['dst_s']:>10.4f} {r['multigrid_s']:>10.4f} {r['multigrid_cycles']:>10}"
+              f" {r['jacobi_s']:>14.4f} {r['multigrid_err']:>10.1e} {r['jacobi_err']:>10.1e}")
@@ -0,0 +1,130 @@
+"""AI 助教的回答生成: 本地占位回答与 OpenAI 兼容接口调用
+
+openai 在首次调用接口时才延迟导入, 未安装该 SDK 时其余模块仍可正常使用。
+客户端按 (base_url, api_key) 在进程内复用 (get_client): 每个 OpenAI 客户端自带保持长连接的 HTTP 连接池,
+同一服务进程中的后续提问不再重新建立 TCP / TLS 连接。stream_llm_api 以流式方式逐段产生回答,
+并记录首字延迟 (TTFT) 与总耗时; 最近的调用记录在 LATENCY_LOG 中。
+"""
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+
+DEFAULT_DEEPSEEK_MODEL = "deepseek-chat"
+SYSTEM_PROMPT = "你是一位精通偏微分方程（PDE）、数值分析和科学计算的专业助教。你的回答应准确、简洁、专业。"
+REQUEST_TIMEOUT = 30.0
+MAX_CLIENTS = 32   # 客户端池的容量 (每个用户自带的 Key 各占一个), 超出时移出最久未用的客户端
+
+# 最近的调用: {"model", "ttft", "total", "chars", "error"}; ttft 为 None 表示没有收到任何内容
+LATENCY_LOG = deque(maxlen=200)
+
+_CLIENTS = OrderedDict()
+_CLIENTS_LOCK = threading.Lock()
+
+
+def simulate_ai_response(prompt):
+    """根据用户输入，模拟一个关于 PDE 的回答"""
+    # 这是一个占位符，用于演示聊天交互
+
+    if "FDM" in prompt or "有限差分" in prompt:
+        return "有限差分法（FDM）是一种通过将微分方程中的导数用代数差分近似来求解 PDE 的方法。它适用于规则网格，但处理复杂几何边界较为困难。您具体想了解 FDM 的哪种格式（如显式、隐式）？"
+    elif "PINNs" in prompt or "物理信息" in prompt:
+        return "PINNs（物理信息神经网络）是一种无需网格和大量标签数据的求解方法。它将 PDE 残差加入损失函数中，让神经网络在训练过程中遵守物理定律。它非常擅长解决反问题。您希望我提供一个 PINNs 解决反问题的例子吗？"
+    elif "Navier-Stokes" in prompt or "纳维-斯托克斯" in prompt:
+        return "纳维-斯托克斯方程是描述粘性流体动量守恒的核心方程。它是一个复杂的非线性 PDE 组，求解难度极大，传统上多采用有限体积法（FVM）进行离散化求解。"
+    else:
+        return "欢迎提出您关于偏微分方程、数值方法或 AI 求解的任何问题！请尽量具体地描述您想了解的概念，我会尽力为您解答。"
+
+
+def get_client(api_key, base_url):
+    """进程级客户端池: 同一 (base_url, api_key) 返回同一个 OpenAI 客户端 (线程安全, 连接保持复用)"""
+    key = (base_url, api_key)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is not None:
+            _CLIENTS.move_to_end(key)
+            return client
+        from openai import OpenAI
+        client = _CLIENTS[key] = OpenAI(api_key=api_key, base_url=base_url, timeout=REQUEST_TIMEOUT)
+        if len(_CLIENTS) > MAX_CLIENTS:
+            # 只移出池, 不调用 close: 其他会话的线程可能仍在用它流式读取; 最后的引用释放后连接随之关闭
+            _CLIENTS.popitem(last=False)
+        return client
+
+
+def system_prompt(model_name):
+    """模型使用的 system 提示词：只有 DeepSeek 默认需要 system 消息, 其余模型为空字符串"""
+    return SYSTEM_PROMPT if model_name == DEFAULT_DEEPSEEK_MODEL else ""
+
+
+def build_messages(prompt, model_name):
+    """构造消息列表 (见 system_prompt)"""
+    messages = [{"role": "user", "content": prompt}]
+    if system_prompt(model_name):
+        messages.insert(0, {"role": "system", "content": system_prompt(model_name)})
+    return messages
+
+
+def stream_llm_api(prompt, api_key, base_url, model_name, stats=None):
+    """流式调用 OpenAI 兼容接口, 逐段产生回答文本 (可直接交给 st.write_stream)
+
+    出错时产生一段错误说明而不是抛出异常。结束后 stats (可选字典) 中写入
+    ttft (首个内容片段的延迟, 秒; 未收到内容时为 None) 与 total (总耗时), 同时追加到 LATENCY_LOG。
+    """
+    stats = {} if stats is None else stats
+    stats.update(model=model_name, ttft=None, total=None, chars=0, error=None)
+    t_start = time.perf_counter()
+    try:
+        # 在 try 内导入: 未安装 SDK 时同样产生一段错误说明, 而不是在 st.write_stream 中抛出异常
+        # (ImportError 的 except 子句须在 APIError 之前, 导入失败时 APIError 尚未定义)
+        from openai import APIError
+        # 逐行读取 SSE 响应并读完整个响应体: HTTP/1.1 连接只有在响应读完后才会放回连接池复用
+        # (SDK 的同步 Stream 在 [DONE] 处直接关闭响应, 连接随之断开)
+        with get_client(api_key, base_url).chat.completions.with_streaming_response.create(
+            model=model_name,
+            messages=build_messages(prompt, model_name),
+            temperature=0.7,
+            stream=True
+        ) as response:
+            for piece in _sse_content(response.iter_lines()):
+                if stats["ttft"] is None:
+                    stats["ttft"] = time.perf_counter() - t_start
+                stats["chars"] += len(piece)
+                yield piece
+        if stats["ttft"] is None:
+            yield "API 响应无内容 (choices 列表为空)。"
+    except ImportError as e:
+        stats["error"] = type(e).__name__
+        yield f"未安装 openai SDK，无法调用接口（pip install openai）：{e}"
+    except APIError as e:
+        stats["error"] = type(e).__name__
+        yield (f"API 请求失败（{getattr(e, 'status_code', None)} {e.code}）。请检查 Base URL, Key 或模型。\n"
+               f"错误详情：{e.message}")
+    except Exception as e:
+        stats["error"] = type(e).__name__
+        yield f"处理时发生未知错误：{e}"
+    finally:
+        stats["total"] = time.perf_counter() - t_start
+        LATENCY_LOG.append(dict(stats))
+
+
+def _sse_content(lines):
+    """从 chat.completion.chunk 的 SSE 行中依次取出非空的 delta.content"""
+    for line in lines:
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            continue
+        chunk = json.loads(data)
+        if chunk.get("error"):
+            raise RuntimeError(chunk["error"].get("message", chunk["error"]))
+        for choice in chunk.get("choices") or ():
+            piece = (choice.get("delta") or {}).get("content")
+            if piece:
+                yield piece
+
+
+def call_llm_api(prompt, api_key, base_url, model_name, stats=None):
+    """使用 OpenAI SDK 执行外部 LLM API 请求, 返回完整回答 (非流式界面与脚本使用)"""
+    return "".join(stream_llm_api(prompt, api_key, base_url, model_name, stats))
@@ -0,0 +1,139 @@
+"""本地的 OpenAI 兼容模拟服务: 无需网络与 Key 即可测试 AI 助教的流式输出、连接复用与延迟统计
+
+服务实现 POST /v1/chat/completions (stream 为真时按 SSE 分段返回, 每段之间等待 token_delay 秒),
+回答内容取自 llm.simulate_ai_response。HTTP/1.1 长连接, connections 记录服务端接受的 TCP 连接数,
+客户端池生效时多次提问只占用一个连接。
+
+命令行: python -m pde_core.llm_mock [--port 8765] [--token-delay 0.02] [--first-token-delay 0.2]
+                                    [--check 5]
+    --check N: 启动服务后用 llm.stream_llm_api 连续提问 N 次, 打印每次的首字延迟 / 总耗时与连接数, 然后退出;
+    不加 --check 时持续运行, 可把界面的 Base URL 指向 http://127.0.0.1:<port>/v1 手动测试。
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .llm import simulate_ai_response, stream_llm_api
+
+CHUNK_CHARS = 4   # 每个 SSE 片段的字符数 (模拟 token)
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    """在后台线程中运行的模拟服务; base_url 可直接传给 OpenAI 客户端"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, token_delay=0.02, first_token_delay=0.2):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+        self.connections = 0
+        self.requests = 0
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-llm", daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # 长连接: 客户端可在同一连接上发送后续请求
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"未知路径 {self.path}", "type": "not_found", "code": None}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.server.requests += 1
+        model = body.get("model", "mock")
+        answer = simulate_ai_response(body.get("messages", [{}])[-1].get("content", ""))
+        time.sleep(self.server.first_token_delay)
+        if not body.get("stream"):
+            self._send_json(200, {
+                "id": "mock", "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": answer},
+                             "finish_reason": "stop"}],
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i in range(0, len(answer), CHUNK_CHARS):
+            if i:
+                time.sleep(self.server.token_delay)
+            self._send_event(_chunk(model, {"content": answer[i:i + CHUNK_CHARS]}, None))
+        self._send_event(_chunk(model, {}, "stop"))
+        self._send_chunk(b"data: [DONE]\n\n")
+        self._send_chunk(b"")   # 分块传输的结束标记
+
+    def _send_json(self, status, obj):
+        data = json.dumps(obj, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_event(self, obj):
+        self._send_chunk(f"data: {json.dumps(obj, ensure_ascii=False)}\n\n".encode())
+
+    def _send_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+def _chunk(model, delta, finish_reason):
+    return {"id": "mock", "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token-delay", type=float, default=0.02, help="相邻片段之间的延迟 (秒)")
+    parser.add_argument("--first-token-delay", type=float, default=0.2, help="首个片段之前的延迟 (秒)")
+    parser.add_argument("--check", type=int, default=0, metavar="N", help="连续提问 N 次后退出")
+    args = parser.parse_args(argv)
+
+    server = MockLLMServer(args.port, args.token_delay, args.first_token_delay).start()
+    print(f"模拟服务: {server.base_url}")
+    if not args.check:
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        server.stop()
+        return
+
+    print(f"{'#':>3}  {'ttft (s)':>9}  {'total (s)':>9}  {'chars':>6}")
+    for i in range(args.check):
+        stats = {}
+        for _ in stream_llm_api("什么是有限差分算法？", "mock-key", server.base_url, "mock-model", stats):
+            pass
+        print(f"{i + 1:>3}  {stats['ttft'] or float('nan'):>9.3f}  {stats['total']:>9.3f}  {stats['chars']:>6}"
+              + (f"  {stats['error']}" if stats["error"] else ""))
+    print(f"请求 {server.requests} 次, TCP 连接 {server.connections} 个")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
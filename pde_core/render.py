@@ -0,0 +1,148 @@
+"""动画帧的快速渲染: 避免每帧新建 matplotlib Figure 并以 dpi=200 整体重绘、编码
+
+- LineAnimation: 一维曲线的持久 Figure。坐标轴、网格、标签只绘制一次并缓存为背景,
+  每帧只恢复背景、重绘曲线与文字 (blitting), 再以低压缩级别编码 PNG
+- decimate_minmax: 把曲线按显示宽度分箱, 每箱保留最小 / 最大值点, 供客户端图表 (Vega-Lite)
+  直接接收数值数组; 峰值不会因抽样丢失, 每帧的数据量与 nx 无关
+- HeatmapFrames: 二维热图不经过 matplotlib。颜色映射预先算成 256 色查找表 (colormap_lut),
+  每帧把 u 一次性量化为 uint8 索引 (与 Normalize + Colormap 的分箱相同), 直接作为调色板 PNG
+  编码 (每像素 1 字节), 或经查找表展开为 RGB uint8 数组交给客户端; 颜色条只渲染一次 (colorbar_png)
+matplotlib 与 PIL (matplotlib 的依赖) 只在创建动画对象时导入。
+"""
+import io
+from functools import lru_cache
+
+import numpy as np
+
+PNG_COMPRESS_LEVEL = 1   # zlib 级别 1: 编码速度约为默认级别的数倍, 动画帧体积只略有增加
+
+
+def decimate_minmax(x, u, max_points=1000):
+    """保留每个分箱中最小值与最大值所在的点 (按原顺序), 返回 (x, u); 点数不超过 max_points 时原样返回"""
+    n = len(u)
+    if n <= max_points:
+        return x, u
+    bins = max_points // 2
+    per = -(-n // bins)   # 每箱点数 (向上取整), 最后一箱以末端值补齐
+    padded = np.pad(u, (0, bins * per - n), mode="edge").reshape(bins, per)
+    base = np.arange(bins) * per
+    idx = np.concatenate([base + padded.argmin(axis=1), base + padded.argmax(axis=1), [0, n - 1]])
+    idx = np.unique(np.minimum(idx, n - 1))
+    return x[idx], u[idx]
+
+
+class LineAnimation:
+    """一维曲线动画: Figure 只创建一次, update 只替换曲线数据与标注文字, png 返回当前帧的 PNG 字节"""
+
+    def __init__(self, x, ylim, title="", xlabel="", ylabel="", color="red", figsize=(8, 4), dpi=100):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        (self.line,) = self.ax.plot(x, np.zeros_like(x, dtype=float), color=color, animated=True)
+        self.label = self.ax.text(0.98, 0.95, "", transform=self.ax.transAxes, ha="right", va="top",
+                                  animated=True)
+        self.ax.set_xlim(x[0], x[-1])
+        self.ax.set_ylim(*ylim)
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.grid(True)
+        self.fig.tight_layout()
+        # 静态部分 (坐标轴、网格、标签) 渲染一次后缓存, 之后每帧只重绘 animated 的曲线与文字
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+
+    def update(self, u, label=""):
+        self.line.set_ydata(u)
+        self.label.set_text(label)
+        self.canvas.restore_region(self._background)
+        self.ax.draw_artist(self.line)
+        self.ax.draw_artist(self.label)
+
+    def png(self):
+        """当前帧编码为 PNG 字节"""
+        from PIL import Image
+        buf = io.BytesIO()
+        Image.fromarray(np.asarray(self.canvas.buffer_rgba())).save(buf, format="png",
+                                                                    compress_level=PNG_COMPRESS_LEVEL)
+        return buf.getvalue()
+
+
+@lru_cache(maxsize=16)
+def colormap_lut(cmap="hot", n=256):
+    """matplotlib 颜色映射的 n 色查找表, 形状 (n, 3) 的只读 uint8 数组"""
+    from matplotlib import colormaps
+    lut = np.round(colormaps[cmap](np.linspace(0, 1, n))[:, :3] * 255).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+def quantize(u, vmin, vmax, n=256, out=None, work=None):
+    """把 u 线性映射到 [0, n) 的整数索引 (uint8, n <= 256), 超出 [vmin, vmax] 的值取端点颜色
+
+    与 Normalize(vmin, vmax) 后由 Colormap 取色相同: 索引 = floor((u - vmin) / (vmax - vmin) * n),
+    截断到 [0, n - 1]。work 为与 u 同形状的浮点临时数组 (可选)。
+    非有限值 (发散的解) 取固定索引: NaN 与 -inf 为 0, +inf 为 n - 1, 不做未定义的浮点到整数转换。
+    """
+    work = np.subtract(u, vmin, out=work)
+    work *= n / (vmax - vmin)
+    np.nan_to_num(work, copy=False, nan=0, posinf=n - 1, neginf=0)
+    np.clip(work, 0, n - 1, out=work)
+    np.floor(work, out=work)
+    if out is None:
+        return work.astype(np.uint8)
+    np.copyto(out, work, casting="unsafe")
+    return out
+
+
+class HeatmapFrames:
+    """二维热图动画帧: 与 imshow(u.T, origin='lower', cmap=cmap, norm=Normalize(vmin, vmax)) 相同的图像
+
+    scale 为最近邻放大倍数 (小网格放大后显示, 不做插值模糊)。量化所需的临时数组只分配一次。
+    """
+
+    def __init__(self, shape, vmin, vmax, cmap="hot", scale=1):
+        self.vmin, self.vmax, self.scale = vmin, vmax, scale
+        self.lut = colormap_lut(cmap)
+        self._palette = self.lut.ravel().tolist()
+        self._work = np.empty(shape)
+        self._index = np.empty(shape, dtype=np.uint8)
+
+    def indices(self, u):
+        """颜色索引图像 (行 = y 从上到下, 列 = x), uint8"""
+        quantize(u, self.vmin, self.vmax, len(self.lut), out=self._index, work=self._work)
+        return self._index.T[::-1]
+
+    def rgb(self, u):
+        """RGB uint8 图像 (H, W, 3), 可直接交给 st.image"""
+        return self.lut[self.indices(u)]
+
+    def png(self, u):
+        """调色板 PNG 字节 (每像素 1 字节, 无需展开为 RGB)"""
+        from PIL import Image
+        image = Image.fromarray(np.ascontiguousarray(self.indices(u)))
+        image.putpalette(self._palette)   # 灰度图加上调色板即成为 "P" 模式
+        if self.scale > 1:
+            image = image.resize((image.width * self.scale, image.height * self.scale), Image.NEAREST)
+        buf = io.BytesIO()
+        image.save(buf, format="png", compress_level=PNG_COMPRESS_LEVEL)
+        return buf.getvalue()
+
+
+def colorbar_png(vmin, vmax, cmap="hot", label="", height=4.0):
+    """单独的竖直颜色条 (只在动画开始时渲染一次)"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.cm import ScalarMappable
+    from matplotlib.colors import Normalize
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(1.1, height), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    cax = fig.add_axes([0.1, 0.05, 0.25, 0.9])
+    fig.colorbar(ScalarMappable(norm=Normalize(vmin, vmax), cmap=cmap), cax=cax, label=label)
+    buf = io.BytesIO()
+    canvas.print_png(buf)
+    return buf.getvalue()
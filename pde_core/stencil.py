@@ -0,0 +1,121 @@
+"""有限差分模板 (Stencil) 引擎: 用整块 NumPy 切片代替逐点 Python 循环
+
+约定:
+    - 所有算子只作用于内部点, 返回形状为 (n-2,) 或 (n-2, m-2) 的数组
+    - 二维数组第 0 维为 i (行), 第 1 维为 j (列), 与各求解器中 T[i, j] 的写法一致
+    - 边界条件由 apply_* 系列函数在原数组上就地施加
+"""
+import numpy as np
+
+
+# ==========================================
+# 1. 差分算子
+# ==========================================
+
+def laplacian_1d(u, h=1.0, out=None):
+    """一维三点差分 (u[i+1] - 2u[i] + u[i-1]) / h², 返回内部点 u[1:-1] 对应的值
+
+    沿最后一维差分, 前面的维度视为批次 (如 (batch, nx) 的参数扫描)。
+    给定 out 时全部运算就地写入 out, 不产生临时数组。
+    """
+    out = np.subtract(u[..., 2:], u[..., 1:-1], out=out)
+    out -= u[..., 1:-1]
+    out += u[..., :-2]
+    if h != 1.0:
+        out /= h**2
+    return out
+
+
+def neighbour_sum_2d(u, out=None):
+    """二维五点模板的四个邻居之和 u[i+1,j] + u[i-1,j] + u[i,j+1] + u[i,j-1]"""
+    out = np.add(u[2:, 1:-1], u[:-2, 1:-1], out=out)
+    out += u[1:-1, 2:]
+    out += u[1:-1, :-2]
+    return out
+
+
+def laplacian_2d(u, dx=1.0, dy=None, out=None, work=None):
+    """二维五点差分 u_xx + u_yy, dx 对应第 0 维, dy 对应第 1 维 (默认 dy = dx)
+
+    work 为与 out 同形状的临时数组; 同时给定 out 与 work 时不产生任何临时数组。
+    """
+    if dy is None:
+        dy = dx
+    center = u[1:-1, 1:-1]
+    if work is None:
+        work = np.empty_like(center)
+    if dx == dy:
+        out = neighbour_sum_2d(u, out=out)
+        out -= np.multiply(center, 4, out=work)
+        if dx != 1.0:
+            out /= dx**2
+        return out
+    out = np.subtract(u[2:, 1:-1], center, out=out)
+    out -= center
+    out += u[:-2, 1:-1]
+    out /= dx**2
+    np.subtract(u[1:-1, 2:], center, out=work)
+    work -= center
+    work += u[1:-1, :-2]
+    work /= dy**2
+    out += work
+    return out
+
+
+# ==========================================
+# 2. 迭代松弛
+# ==========================================
+
+def jacobi_step_2d(u, rhs=None, out=None):
+    """一次 Jacobi 迭代: u_new[i,j] = 0.25 * (四邻居之和 + rhs[i,j]), 边界值原样保留
+
+    out 为 None 时返回新数组; 否则写入 out (不能与 u 为同一数组)。
+    """
+    if out is None:
+        out = u.copy()
+    else:
+        out[...] = u
+    inner = out[1:-1, 1:-1]
+    neighbour_sum_2d(u, out=inner)
+    if rhs is not None:
+        inner += rhs[1:-1, 1:-1]
+    inner *= 0.25
+    return out
+
+
+# ==========================================
+# 3. 边界条件
+# ==========================================
+
+def apply_dirichlet_1d(u, left=0.0, right=0.0):
+    """一维 Dirichlet 边界: 固定两端的函数值"""
+    u[0] = left
+    u[-1] = right
+    return u
+
+
+def apply_dirichlet_2d(u, top=0.0, bottom=0.0, left=0.0, right=0.0):
+    """二维 Dirichlet 边界: top/bottom 对应第 0 行/最后一行, left/right 对应第 0 列/最后一列"""
+    u[:, 0] = left
+    u[:, -1] = right
+    u[0, :] = top
+    u[-1, :] = bottom
+    return u
+
+
+def apply_neumann_2d(u):
+    """二维零法向导数 (绝热) 边界: 边界值取相邻内部点的值"""
+    u[0, :] = u[1, :]
+    u[-1, :] = u[-2, :]
+    u[:, 0] = u[:, 1]
+    u[:, -1] = u[:, -2]
+    return u
+
+
+def apply_periodic_2d(u):
+    """二维周期边界: 边界层与对侧的内部层相同 (u[0] ≡ u[-2], u[-1] ≡ u[1])"""
+    u[0, :] = u[-2, :]
+    u[-1, :] = u[1, :]
+    u[:, 0] = u[:, -2]
+    u[:, -1] = u[:, 1]
+    return u
@@ -0,0 +1,102 @@
+"""求解与显示解耦: 后台线程推进时间层, 界面按目标帧率取最新的一帧
+
+    stream = FrameStream(march, every=10, on_step=callback)
+    for n, t, u in stream.frames(fps=30):
+        placeholder.image(...)
+
+生产者 (后台线程) 逐步迭代 march ((t, dt, u) 生成器, 见 adaptive.fixed_steps), 每 every 步把 u 的拷贝
+放入容量为 maxsize 的队列; 队列已满时丢弃最旧的帧, 因此求解永远不会等待绘图。
+消费者 (脚本线程) 每 1/fps 秒取一次队列中最新的帧, 之前积压的帧直接丢弃; 求解结束时立即取出最后一帧,
+不再等待下一个显示周期。总耗时约为纯计算时间加上最后一帧的绘制时间。
+
+on_step(n, t, dt, u) 在生产者线程中对每一步调用 (例如轨迹记录、步长统计), u 是工作区缓冲, 不可保留引用。
+NumPy 的大数组运算会释放 GIL, 网格较大时求解与绘图可以真正并行。
+"""
+import threading
+import time
+from collections import deque
+
+
+class FrameStream:
+    """在后台线程中推进 march 并以有界队列向界面提供帧
+
+    produced / dropped: 放入队列的帧数与未显示就被丢弃的帧数; steps: 已推进的步数;
+    compute_time: 生产者迭代 march 本身的耗时 (不含拷贝帧与 on_step)。
+    """
+
+    def __init__(self, march, every=1, maxsize=2, on_step=None):
+        self.march = march
+        self.every = max(1, int(every))
+        self.on_step = on_step
+        self.produced = 0
+        self.dropped = 0
+        self.steps = 0
+        self.compute_time = 0.0
+        self._queue = deque()
+        self._maxsize = max(1, int(maxsize))
+        self._cond = threading.Condition()
+        self._done = False
+        self._stop = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._produce, name="frame-stream", daemon=True)
+
+    def _publish(self, frame):
+        with self._cond:
+            if len(self._queue) == self._maxsize:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(frame)
+            self.produced += 1
+            self._cond.notify()
+
+    def _produce(self):
+        last = None
+        try:
+            t_start = time.perf_counter()
+            for n, (t, dt, u) in enumerate(self.march):
+                self.compute_time += time.perf_counter() - t_start
+                self.steps = n + 1
+                if self.on_step is not None:
+                    self.on_step(n, t, dt, u)
+                if n % self.every == 0:
+                    self._publish((n, t, u.copy()))
+                    last = None
+                else:
+                    last = (n, t, u)
+                if self._stop.is_set():
+                    return
+                t_start = time.perf_counter()
+            if last is not None:   # 最后一步不在 every 的整数倍上时也显示终态
+                self._publish((last[0], last[1], last[2].copy()))
+        except BaseException as exc:
+            self._error = exc
+        finally:
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def frames(self, fps=30):
+        """启动生产者并按不超过 fps 的帧率产生 (n, t, u); 提前退出迭代时后台线程随之停止"""
+        interval = 1.0 / fps
+        self._thread.start()
+        try:
+            next_due = time.perf_counter()
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._queue or self._done)
+                    if not self._queue:
+                        break
+                    frame = self._queue.pop()
+                    self.dropped += len(self._queue)
+                    self._queue.clear()
+                yield frame
+                # 等到下一个显示周期; 生产者结束时立刻唤醒, 取出最后一帧
+                next_due = max(next_due + interval, time.perf_counter())
+                with self._cond:
+                    self._cond.wait_for(lambda: self._done,
+                                        timeout=max(0.0, next_due - time.perf_counter()))
+        finally:
+            self._stop.set()
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
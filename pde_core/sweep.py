@@ -0,0 +1,115 @@
+"""一维热传导 / 波动方程的批量参数扫描
+
+第 0 维为批次维: 每个成员是一组 (参数, 初始条件, dt), 所有成员在同一个向量化的模板更新中推进,
+一次 NumPy 运算处理整批数据, 不再为每组参数单独运行一遍 Python 循环。
+
+每个成员使用各自的 CFL 稳定步长: 快照间隔 Δt_snap 被等分为 n_b 步, n_b 为满足稳定性的最小步数。
+步数较少的成员完成本段后暂停 (系数置零或保持状态), 等待其余成员到达同一快照时刻,
+因此所有成员的快照在相同的物理时刻给出, 形状为 (batch, nx)。
+
+两端均为 Dirichlet 边界, 保持初始条件中的端点值。
+"""
+import numpy as np
+
+from .stencil import laplacian_1d
+from .heat import explicit_stable_dt
+from .wave import wave_stable_dt
+from .workspace import Workspace
+
+
+def heat_1d_sweep(u0, alpha, t_end, n_snapshots=10, dt=None, dx=None):
+    """批量推进 u_t = α u_xx (显式格式), 返回 (times, snapshots, info)
+
+    u0: (nx,) 或 (batch, nx) 初始条件; alpha / dt: 标量或 (batch,) 数组, 与 u0 的批次维广播。
+    dt 为 None 时取各成员的显式稳定步长, 超过稳定步长的 dt 也会被截断为稳定步长。
+    dx 默认为 1 / (nx - 1)。
+    snapshots 形状为 (n_snapshots + 1, batch, nx), snapshots[k] 对应 times[k] 时刻。
+    info: {"dt": 各成员实际步长, "steps": 各成员总步数}。
+    """
+    u, (alpha, dt), dx = _broadcast_members(u0, alpha, dt, dx)
+    dt_stable = explicit_stable_dt(alpha, dx)
+    times, steps, dt = _member_steps(t_end, n_snapshots, dt, dt_stable)
+    gamma = alpha * dt / dx**2
+
+    ws = Workspace(u)
+    g = np.empty_like(gamma)
+
+    def step(k):
+        u = ws.current
+        lap = laplacian_1d(u, out=ws.scratch("lap", (u.shape[0], u.shape[1] - 2)))
+        # 已完成本段步数的成员系数置零, 状态保持不变
+        lap *= np.multiply(gamma, k < steps, out=g)[:, None]
+        u[:, 1:-1] += lap
+
+    snapshots = _run_intervals(ws, step, n_snapshots, steps)
+    return times, snapshots, {"dt": dt, "steps": steps * n_snapshots}
+
+
+def wave_1d_sweep(u0, c, t_end, n_snapshots=10, dt=None, dx=None):
+    """批量推进 u_tt = c² u_xx (蛙跳格式, 初始速度为零), 返回 (times, snapshots, info)
+
+    参数与返回值同 heat_1d_sweep, c 为波速。dt 为 None 时取各成员的稳定步长 wave_stable_dt。
+    第一步使用 Taylor 展开 u^{-1} = u^0 + (r²/2) L u^0, 保持二阶精度。
+    """
+    u, (c, dt), dx = _broadcast_members(u0, c, dt, dx)
+    dt_stable = wave_stable_dt(c, dx)
+    times, steps, dt = _member_steps(t_end, n_snapshots, dt, dt_stable)
+    r2 = ((c * dt / dx)**2)[:, None]
+
+    # 三缓冲: next / current / previous 轮换, 端点值在所有时间层中保持一致
+    ws = Workspace(u, levels=3)
+    ws.previous[...] = u
+    ws.previous[:, 1:-1] += 0.5 * r2 * laplacian_1d(u)
+    ws.next[...] = u
+
+    def step(k):
+        u, u_prev, u_next = ws.current, ws.previous, ws.next
+        inner = laplacian_1d(u, out=u_next[:, 1:-1])
+        inner *= r2
+        inner += u[:, 1:-1]
+        inner += u[:, 1:-1]
+        inner -= u_prev[:, 1:-1]
+        idle = (k >= steps)[:, None]
+        if idle.any():
+            # 已完成本段步数的成员: 交换后 current 仍为 u, previous 仍为 u_prev
+            np.copyto(u_next, u, where=idle)
+            np.copyto(u, u_prev, where=idle)
+        ws.advance()
+
+    snapshots = _run_intervals(ws, step, n_snapshots, steps)
+    return times, snapshots, {"dt": dt, "steps": steps * n_snapshots}
+
+
+def _broadcast_members(u0, param, dt, dx):
+    """把初始条件与逐成员参数广播到共同的批次维, 返回 (u (batch, nx) 副本, (param, dt), dx)"""
+    u0 = np.atleast_2d(np.asarray(u0, dtype=float))
+    param = np.asarray(param, dtype=float)
+    dt = np.asarray(np.inf if dt is None else dt, dtype=float)
+    batch = np.broadcast_shapes(u0.shape[:1], param.shape, dt.shape)
+    if len(batch) != 1:
+        raise ValueError(f"参数的批次维必须是一维: {batch}")
+    nx = u0.shape[1]
+    u = np.array(np.broadcast_to(u0, batch + (nx,)))
+    if dx is None:
+        dx = 1.0 / (nx - 1)
+    return u, (np.broadcast_to(param, batch).copy(), np.broadcast_to(dt, batch).copy()), dx
+
+
+def _member_steps(t_end, n_snapshots, dt, dt_stable):
+    """各成员每个快照间隔的步数与实际步长: 步长不超过 min(dt, dt_stable), 且整除快照间隔"""
+    times = np.linspace(0.0, t_end, n_snapshots + 1)
+    interval = t_end / n_snapshots
+    steps = np.maximum(np.ceil(interval / np.minimum(dt, dt_stable)), 1).astype(int)
+    return times, steps, interval / steps
+
+
+def _run_intervals(ws, step, n_snapshots, steps):
+    """逐段推进 step(k) (k 为段内步序号, 共 max(steps) 步), 每段结束时记录快照"""
+    snapshots = np.empty((n_snapshots + 1,) + ws.current.shape)
+    snapshots[0] = ws.current
+    n_max = int(steps.max())
+    for s in range(1, n_snapshots + 1):
+        for k in range(n_max):
+            step(k)
+        snapshots[s] = ws.current
+    return snapshots
@@ -0,0 +1,163 @@
+"""时间推进轨迹的磁盘记录与惰性回放
+
+TrajectoryRecorder 每隔 every 步把一帧写入 .npy 文件 (形状 (帧数, *网格形状)), 帧直接写到文件中的偏移处,
+不在内存中累积, 因此可以记录上千帧 512×512 的模拟而进程内存不增长。
+同名的 .json 旁注文件记录网格、dt、参数、已写帧数与各帧的时间。
+
+load_trajectory 以内存映射方式打开文件, 按切片读取时才从磁盘载入对应的帧:
+    traj = load_trajectory("run.npy")
+    traj[100]          # 第 100 帧
+    traj[::10, 64]     # 每 10 帧取第 64 行
+    traj.times, traj.meta
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+META_FLUSH_FRAMES = 256
+MAX_FRAMES = 10**12
+
+
+def meta_path(path):
+    """轨迹文件对应的旁注文件路径 (扩展名换为 .json)"""
+    return os.path.splitext(path)[0] + ".json"
+
+
+def n_recorded_frames(steps, every):
+    """推进 steps 步、每 every 步记录一帧 (含初始帧) 时的帧数"""
+    return steps // every + 1
+
+
+def open_recorder(path, frame_shape, steps, every=1, dtype=np.float64, **meta):
+    """path 为 None 时返回 None (不记录), 否则返回按 steps 步预留容量的 TrajectoryRecorder (容量不足时自动增长)"""
+    if not path:
+        return None
+    return TrajectoryRecorder(path, frame_shape, n_recorded_frames(steps, every), every, dtype, **meta)
+
+
+class TrajectoryRecorder:
+    """逐帧写入 .npy 轨迹文件, 可用作上下文管理器 (退出时自动 close)
+
+    capacity 为预留的帧数, 写满后文件容量自动加倍 (自适应步长时帧数事先未知), 文件头中的帧数始终等于当前容量;
+    close 时文件截断到实际写入的帧数。
+    meta 中的关键字参数 (如 grid、dt、参数) 原样写入旁注文件。
+    """
+
+    def __init__(self, path, frame_shape, capacity, every=1, dtype=np.float64, **meta):
+        self.path = path
+        self.frame_shape = tuple(frame_shape)
+        self.capacity = int(capacity)
+        self.every = int(every)
+        self.dtype = np.dtype(dtype)
+        self.meta = meta
+        self.times = []
+        self._frame_bytes = self.dtype.itemsize * int(np.prod(self.frame_shape))
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "wb")
+        # 文件头按足够大的帧数留出空间, 写入的是当前容量 (与文件大小一致, 中断的记录仍是合法的 .npy),
+        # 容量增长与 close 时原地改写
+        self._offset = len(_npy_header(self.dtype, (MAX_FRAMES,) + self.frame_shape))
+        self._resize(self.capacity)
+        self._write_meta()
+
+    @property
+    def n_frames(self):
+        return len(self.times)
+
+    def record(self, n, u, t=None):
+        """第 n 步的状态 u (t 为其物理时间); n 是 every 的整数倍时写入一帧并返回 True"""
+        if n % self.every:
+            return False
+        if len(self.times) >= self.capacity:
+            self._resize(self.capacity * 2)
+        frame = np.ascontiguousarray(u, dtype=self.dtype)
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"帧形状 {frame.shape} 与记录器 {self.frame_shape} 不一致")
+        self._file.seek(self._offset + len(self.times) * self._frame_bytes)
+        self._file.write(memoryview(frame).cast("B"))
+        self.times.append(float(n if t is None else t))
+        if len(self.times) % META_FLUSH_FRAMES == 0:
+            # 定期更新旁注文件, 记录中断时已写入的帧仍可读取
+            self._write_meta()
+        return True
+
+    def close(self):
+        """截断未用的预留空间, 把文件头中的帧数改为实际帧数, 写入旁注文件"""
+        if self._file.closed:
+            return
+        self._resize(len(self.times))
+        self._file.close()
+        self._write_meta()
+
+    def _resize(self, capacity):
+        """文件容量改为 capacity 帧, 文件头中的帧数随之改写"""
+        self.capacity = capacity
+        self._file.truncate(self._offset + capacity * self._frame_bytes)
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, (capacity,) + self.frame_shape, size=self._offset))
+        self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_meta(self):
+        info = {"frame_shape": list(self.frame_shape), "dtype": self.dtype.str, "every": self.every,
+                "n_frames": len(self.times), "times": self.times, **self.meta}
+        tmp = meta_path(self.path) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False, indent=2, default=_json_default)
+        os.replace(tmp, meta_path(self.path))
+
+
+class Trajectory:
+    """只读的已记录轨迹: frames 为内存映射数组, 按切片读取时才载入对应的帧"""
+
+    def __init__(self, frames, meta):
+        self.frames = frames
+        self.meta = meta
+        self.times = np.asarray(meta.get("times", []), dtype=float)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+
+def load_trajectory(path):
+    """打开 TrajectoryRecorder 写出的轨迹 (不读入帧数据)"""
+    with open(meta_path(path), encoding="utf-8") as f:
+        meta = json.load(f)
+    # 记录过程中断时文件头中的帧数是预留容量, 按旁注文件中的已写帧数映射, 不依赖文件头的形状
+    with open(path, "rb") as f:
+        np.lib.format.read_magic(f)
+        _, _, dtype = np.lib.format.read_array_header_1_0(f)
+        offset = f.tell()
+    shape = (meta["n_frames"], *meta["frame_shape"])
+    if meta["n_frames"] == 0:
+        return Trajectory(np.empty(shape, dtype=dtype), meta)
+    return Trajectory(np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape), meta)
+
+
+def _npy_header(dtype, shape, size=None):
+    """.npy 1.0 格式文件头; size 给定时用空格补齐到该长度 (用于原地改写帧数)"""
+    text = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": shape})
+    # 魔数 + 版本 (8 字节) 与头长度 (2 字节) 之后是以换行结尾的字典文本, 总长按 64 字节对齐
+    if size is None:
+        size = -(-(10 + len(text) + 1) // 64) * 64
+    text = text.ljust(size - 11) + "\n"
+    return np.lib.format.magic(1, 0) + struct.pack("<H", len(text)) + text.encode("latin1")
+
+
+def _json_default(obj):
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"无法写入 JSON: {type(obj)}")
@@ -0,0 +1,81 @@
+"""三对角线性方程组的预分解与批量求解 (隐式 / Crank-Nicolson / ADI 时间格式共用)
+
+使用 LAPACK ?gttrf / ?gttrs (带部分主元的三对角 LU, 即 Thomas 算法的稳健版本):
+系数矩阵在一次模拟中只分解一次, 之后每个时间步的求解都是 O(n) 的编译代码,
+并且一次调用可以同时求解共享同一矩阵的多组右端项 (按列排列)。
+"""
+import numpy as np
+
+
+def factor_tridiagonal(lower, diag, upper):
+    """分解三对角矩阵 (lower: 次对角线 n-1, diag: 主对角线 n, upper: 超对角线 n-1)
+
+    返回分解结果, 供 solve_factored 重复使用。实数或复数系数均可。
+    """
+    # SciPy 在首次分解时才导入, 使只用显式格式的调用方 (及 import 本包) 不依赖 SciPy
+    from scipy.linalg import get_lapack_funcs
+
+    lower, diag, upper = (np.asarray(a) for a in (lower, diag, upper))
+    gttrf, gttrs = get_lapack_funcs(("gttrf", "gttrs"), (lower, diag, upper))
+    dl, d, du, du2, ipiv, info = gttrf(lower, diag, upper)
+    if info != 0:
+        raise np.linalg.LinAlgError(f"三对角矩阵奇异 (gttrf info={info})")
+    return gttrs, dl, d, du, du2, ipiv
+
+
+def factor_constant_tridiagonal(n, lower, diag, upper):
+    """分解 n 阶常系数三对角矩阵 tridiag(lower, diag, upper)"""
+    dtype = np.result_type(lower, diag, upper, 1.0)
+    return factor_tridiagonal(np.full(n - 1, lower, dtype=dtype), np.full(n, diag, dtype=dtype),
+                              np.full(n - 1, upper, dtype=dtype))
+
+
+def solve_factored(factor, rhs, overwrite=False):
+    """用预分解结果求解 A x = rhs
+
+    rhs 形状为 (n,) 或 (n, k): 后者的每一列是一个独立的右端项 (批量求解)。
+    默认返回与 rhs 形状相同的新数组; overwrite=True 时解写回 rhs 并返回 rhs
+    (rhs 为 Fortran 连续且类型与分解一致时 LAPACK 直接就地求解, 无需复制)。
+    """
+    gttrs, dl, d, du, du2, ipiv = factor
+    b = rhs if rhs.ndim == 2 else rhs[:, None]
+    x, info = gttrs(dl, d, du, du2, ipiv, b, overwrite_b=overwrite)
+    if info != 0:
+        raise ValueError(f"三对角求解参数错误 (gttrs info={info})")
+    if not overwrite:
+        return x.reshape(rhs.shape)
+    if not np.shares_memory(x, b):
+        b[...] = x
+    return rhs
+
+
+def factor_cyclic_tridiagonal(n, lower, diag, upper):
+    """分解 n 阶常系数循环三对角矩阵 (周期边界): 在 tridiag 的基础上
+    A[0, n-1] = lower, A[n-1, 0] = upper
+
+    使用 Sherman-Morrison 公式 A = T + u vᵀ, 预先求出 T⁻¹u, 每次求解只需一次三对角回代。
+    """
+    dtype = np.result_type(lower, diag, upper, 1.0)
+    gamma = -diag
+    main = np.full(n, diag, dtype=dtype)
+    main[0] -= gamma
+    main[-1] -= upper * lower / gamma
+    factor = factor_tridiagonal(np.full(n - 1, lower, dtype=dtype), main,
+                                np.full(n - 1, upper, dtype=dtype))
+    u = np.zeros(n, dtype=dtype)
+    u[0], u[-1] = gamma, upper
+    z = solve_factored(factor, u)
+    v_last = lower / gamma
+    return factor, z, v_last, 1 + z[0] + v_last * z[-1]
+
+
+def solve_cyclic_factored(cyclic_factor, rhs, overwrite=False, work=None):
+    """用 factor_cyclic_tridiagonal 的结果求解 A x = rhs, rhs 形状为 (n,) 或 (n, k)
+
+    overwrite 含义同 solve_factored; work 为与 rhs 同形状的临时数组, 给定时修正项不再新建数组。
+    """
+    factor, z, v_last, denom = cyclic_factor
+    y = solve_factored(factor, rhs, overwrite=overwrite)
+    coef = (y[0] + v_last * y[-1]) / denom
+    y -= np.multiply.outer(z, coef, out=work)
+    return y
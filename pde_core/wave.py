@@ -0,0 +1,81 @@
+"""一维波动方程 u_tt = c² u_xx (两端固定 u = 0) 的时间推进工具
+
+- 蛙跳格式 (leapfrog) 受 CFL 条件 c dt / dx <= 1 限制, 见 wave_stable_dt; make_wave_1d_stepper 在三缓冲
+  工作区上推进, start_leapfrog 用 Taylor 展开设置第一步之前的时间层, 使整体保持二阶精度
+- wave_1d_adaptive: 线方法 (method of lines) 把方程写成一阶系统 y = (u, v), u_t = v, v_t = c² u_xx,
+  用 Bogacki-Shampine 3(2) 嵌入式 Runge-Kutta 自适应控制步长 (见 adaptive.rk23)
+"""
+import numpy as np
+
+from .adaptive import rk23
+from .stencil import laplacian_1d, apply_dirichlet_1d
+
+
+def wave_stable_dt(c, dx, safety=0.9):
+    """一维波动方程蛙跳格式的最大稳定时间步 (Courant 数 r = c dt / dx = 1) 乘以安全系数"""
+    return safety * dx / c
+
+
+def make_wave_1d_stepper(r):
+    """返回蛙跳格式 u^{n+1} = 2u^n - u^{n-1} + r² δ²u^n 的推进函数 step(ws), r = c dt / dx 为 Courant 数
+
+    ws 为三缓冲工作区 (Workspace(u0, levels=3)), 上一时间层需先由 start_leapfrog 设置。
+    """
+    r2 = r**2
+
+    def step(ws):
+        u, u_prev, u_next = ws.current, ws.previous, ws.next
+        inner = laplacian_1d(u, out=u_next[1:-1])
+        inner *= r2
+        inner += u[1:-1]
+        inner += u[1:-1]
+        inner -= u_prev[1:-1]
+        apply_dirichlet_1d(u_next) # 两端固定为 0
+        return ws.advance()
+    return step
+
+
+def start_leapfrog(ws, r, dt=None, v0=None):
+    """由初始位移 ws.current 与初始速度 v0 (默认为零) 设置虚拟时间层 u^{-1}
+
+    u^{-1} = u^0 - dt v0 + (r²/2) δ²u^0 (Taylor 展开, 误差 O(dt³)); 直接取 u^{-1} = u^0
+    相当于初速度带有 O(dt) 的误差, 会使蛙跳格式整体降为一阶。给定 v0 时必须同时给定时间步长 dt。
+    """
+    if v0 is not None and dt is None:
+        raise ValueError("给定初始速度 v0 时必须同时给定时间步长 dt")
+    u, u_prev = ws.current, ws.previous
+    inner = laplacian_1d(u, out=u_prev[1:-1])
+    inner *= 0.5 * r**2
+    u_prev += u
+    if v0 is not None:
+        u_prev -= dt * np.asarray(v0)
+    apply_dirichlet_1d(u_prev)
+
+
+def make_wave_1d_rhs(c, dx):
+    """返回半离散系统的右端 f(t, y, out), y 形状 (2, nx): y[0] 为位移 u, y[1] 为速度 v"""
+    coef = c**2 / dx**2
+
+    def f(t, y, out):
+        np.copyto(out[0], y[1])
+        acc = laplacian_1d(y[0], out=out[1, 1:-1])
+        acc *= coef
+        # 两端固定: 位移与速度均保持为 0
+        out[:, 0] = 0.0
+        out[:, -1] = 0.0
+    return f
+
+
+def wave_1d_adaptive(u0, c, dx, t_end, v0=None, rtol=1e-3, atol=1e-6, dt0=None, info=None):
+    """自适应步长推进波动方程, 每接受一步产生 (t, dt, u), u 为位移 (内部数组的视图, 需要时请复制)
+
+    v0 为初始速度 (默认为零); dt0 默认为蛙跳格式的稳定步长。
+    """
+    y0 = np.zeros((2, len(u0)))
+    y0[0] = u0
+    if v0 is not None:
+        y0[1] = v0
+    if dt0 is None:
+        dt0 = wave_stable_dt(c, dx)
+    for t, dt, y in rk23(make_wave_1d_rhs(c, dx), y0, t_end, dt0, rtol, atol, info=info):
+        yield t, dt, y[0]
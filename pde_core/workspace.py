@@ -0,0 +1,54 @@
+"""时间推进循环的预分配工作区 (ping-pong 缓冲)
+
+时间层数组在创建时一次性分配, 之后每步只交换引用, 不再复制或新建:
+    - 双缓冲 (levels=2): 一步格式 (热传导显式 / ADI), current 与 next 轮换
+    - 三缓冲 (levels=3): 两步格式 (波动方程蛙跳), next / current / previous 轮换
+每步所需的临时数组 (差分结果、三对角右端项等) 由 scratch 按名称缓存, 配合 NumPy 的 out= 参数
+就地写入。因此内存占用与步数无关, 循环中也没有分配器开销。
+"""
+import numpy as np
+
+
+class Workspace:
+    """时间层缓冲区与具名临时数组
+
+    levels[0] 为当前时间层 (current), levels[1] 为上一时间层 (previous),
+    levels[-1] 为下一时间层的写入目标 (next)。双缓冲时 previous 与 next 是同一个数组。
+    """
+
+    def __init__(self, u0, levels=2):
+        if levels < 2:
+            raise ValueError(f"时间层数至少为 2: {levels}")
+        u0 = np.asarray(u0)
+        self.levels = [u0.copy()] + [np.zeros_like(u0) for _ in range(levels - 1)]
+        self._scratch = {}
+
+    @property
+    def current(self):
+        return self.levels[0]
+
+    @property
+    def previous(self):
+        return self.levels[1]
+
+    @property
+    def next(self):
+        return self.levels[-1]
+
+    def advance(self):
+        """next 成为新的当前层, 其余各层依次后移 (最旧的一层成为下一次的写入目标), 返回 current"""
+        self.levels.insert(0, self.levels.pop())
+        return self.levels[0]
+
+    def scratch(self, name, shape, dtype=float, order="C"):
+        """按名称取得临时数组: 首次调用 (或形状/类型改变) 时分配, 之后返回同一个数组, 内容未定义"""
+        buf = self._scratch.get(name)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != np.dtype(dtype):
+            buf = np.empty(shape, dtype=dtype, order=order)
+            self._scratch[name] = buf
+        return buf
+
+    @property
+    def nbytes(self):
+        """工作区占用的总字节数"""
+        return sum(a.nbytes for a in self.levels) + sum(a.nbytes for a in self._scratch.values())
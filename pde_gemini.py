@@ -1,11 +1,34 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.colors import Normalize # 用于热力图
+import os
+import shutil
 import time
-import requests
-from openai import OpenAI
-from openai import APIError
+import uuid
+
+# 数值核心位于 pde_core 包 (不依赖 Streamlit); 本文件只负责界面
+from pde_core.heat import (
+    explicit_stable_dt, explicit_stable_dt_2d, make_heat_1d_stepper, make_heat_2d_stepper,
+    apply_boundary_2d, measure_heat_2d_throughput, heat_1d_adaptive, heat_2d_adaptive,
+)
+from pde_core.adaptive import fixed_steps
+from pde_core.workspace import Workspace
+from pde_core.sweep import heat_1d_sweep, wave_1d_sweep
+from pde_core.dataset import generate_dataset, dataset_progress, iter_dataset, PARAM_NAMES
+from pde_core.trajectory import open_recorder, load_trajectory
+from pde_core.zoo import (
+    simulate_laplace, simulate_poisson, simulate_helmholtz, simulate_heat_transfer,
+    simulate_wave_equation, simulate_navier_stokes_cavity, simulate_schrodinger,
+    simulate_schrodinger_stationary, render_simulation, initial_condition_1d, initial_condition_2d,
+)
+from pde_core.render import LineAnimation, decimate_minmax, HeatmapFrames, colorbar_png
+from pde_core.stream import FrameStream
+from pde_core.cache import ResultCache, warm_up
+from pde_core.animation import heat_1d_animation, heat_2d_animation, line_player_html, heatmap_player_html
+from pde_core.llm import simulate_ai_response, stream_llm_api, system_prompt, DEFAULT_DEEPSEEK_MODEL, LATENCY_LOG
+from pde_core.answer_cache import AnswerCache
 
 
 # --- 页面配置 ---
@@ -26,7 +49,6 @@ DEFAULT_CHATGPT_MODEL = "gpt-4o-mini"
 
 # 模式 2: DeepSeek API 配置 (需要用户 Key)
 DEFAULT_DEEPSEEK_BASE_URL = "https://api.deepseek.com"
-DEFAULT_DEEPSEEK_MODEL = "deepseek-chat"
 
 # ==========================================
 # 0. 习题数据字典 (用于习题板块) - 完整版
@@ -148,6 +170,86 @@ EXERCISES = {
     ],
 }
 
+# 拉普拉斯/泊松方程可选的求解器 (界面名称 -> solve_steady_state 的 solver 参数)
+STEADY_SOLVERS = {
+    "多重网格 (Multigrid)": "multigrid",
+    "快速正弦变换 (DST)": "dst",
+    "Jacobi 迭代 (固定次数)": "jacobi",
+}
+
+# 一维热传导的时间格式 (界面名称 -> heat.make_heat_1d_stepper 的 scheme 参数;
+# "adaptive" 为 Crank-Nicolson + 步长倍增误差控制, 见 heat.heat_1d_adaptive)
+HEAT_1D_SCHEMES = {
+    "显式 (Explicit)": "explicit",
+    "Crank-Nicolson": "crank_nicolson",
+    "全隐式 (Implicit Euler)": "implicit",
+    "自适应步长 (CN + 步长倍增)": "adaptive",
+}
+
+# 二维热传导的边界条件 (界面名称 -> heat.apply_boundary_2d 的 boundary 参数)
+BOUNDARY_2D = {
+    "固定温度": "dirichlet",
+    "绝热": "neumann",
+    "周期性": "periodic",
+}
+
+# 二维热传导的时间格式 (界面名称 -> heat.make_heat_2d_stepper 的 scheme 参数;
+# "adaptive" 为 ADI + 步长倍增误差控制, 见 heat.heat_2d_adaptive)
+HEAT_2D_SCHEMES = {
+    "显式 (Explicit)": "explicit",
+    "交替方向隐式 (ADI)": "adi",
+    "自适应步长 (ADI + 步长倍增)": "adaptive",
+}
+
+# 自适应步长可选的相对误差容限
+ADAPTIVE_RTOLS = [1e-2, 1e-3, 1e-4, 1e-5]
+
+# 一维动画的渲染方式 (界面名称 -> run_1d_simulation 的 renderer 参数)
+RENDERERS_1D = {
+    "客户端图表 (Vega-Lite)": "chart",
+    "Matplotlib (持久 Figure)": "matplotlib",
+}
+# 客户端图表每帧最多发送的点数 (按最小/最大值分箱抽样, 见 render.decimate_minmax)
+CHART_MAX_POINTS = 1000
+# 动画的目标帧率: 求解在后台线程中进行, 界面每帧只取最新的解 (见 stream.FrameStream)
+ANIMATION_FPS = 30
+# 二维热图: 温度的颜色范围 (假设最大温度为 100) 与小网格最近邻放大后的目标显示边长 (像素)
+HEATMAP_RANGE = (0.0, 100.0)
+HEATMAP_DISPLAY_PX = 480
+
+# 方程博物馆与预计算动画的结果缓存 (磁盘目录与大小上限可由环境变量配置, 同一主机上的多个服务进程共享)
+CACHE_DIR = os.environ.get("PDE_CACHE_DIR", "cache")
+RESULT_CACHE = ResultCache(CACHE_DIR, int(os.environ.get("PDE_CACHE_MAX_MB", "512")) * 2**20)
+
+# 轨迹记录: 每个浏览器会话写入 TRAJECTORY_DIR 下自己的子目录, 超过 TRAJECTORY_MAX_AGE 秒未更新的会话目录在
+# 新会话开始时删除
+TRAJECTORY_DIR = os.environ.get("PDE_TRAJECTORY_DIR", "trajectories")
+TRAJECTORY_MAX_AGE = 24 * 3600
+
+# 界面生成的代理模型数据集只能写入 DATASET_ROOT 下的子目录; 样本数与进程数有上限, 更大的数据集用命令行生成
+DATASET_ROOT = os.environ.get("PDE_DATASET_DIR", "surrogate_data")
+DATASET_UI_MAX_SAMPLES = 4096
+DATASET_UI_WORKERS = min(4, os.cpu_count() or 1)
+
+# AI 助教的回答缓存: 有效期 (小时)、条目数上限与近似问题的 n-gram 相似度阈值 (默认 0: 只做精确匹配)
+ANSWER_CACHE = AnswerCache(os.path.join(CACHE_DIR, "answers.sqlite3"),
+                           ttl=float(os.environ.get("PDE_ANSWER_TTL_HOURS", "168")) * 3600,
+                           max_entries=int(os.environ.get("PDE_ANSWER_CACHE_MAX", "5000")),
+                           similarity=float(os.environ.get("PDE_ANSWER_SIMILARITY", "0")))
+
+# 方程博物馆各演示在界面控件取默认值时的参数 (缓存名 -> (simulate 函数, 参数)), 服务启动时在后台预热;
+# 控件的默认值也从这里读取, 保证首次点击命中预热的结果
+ZOO_DEMOS = {
+    "laplace": (simulate_laplace, {"solver": "multigrid"}),
+    "poisson": (simulate_poisson, {"solver": "multigrid"}),
+    "helmholtz": (simulate_helmholtz, {}),
+    "heat_transfer": (simulate_heat_transfer, {}),
+    "wave_equation": (simulate_wave_equation, {"method": "leapfrog", "rtol": 1e-2}),
+    "navier_stokes_cavity": (simulate_navier_stokes_cavity, {"N": 65, "Re": 100}),
+    "schrodinger": (simulate_schrodinger, {}),
+    "schrodinger_stationary": (simulate_schrodinger_stationary, {"k": 5, "N": 2000}),
+}
+
 # --- 侧边栏导航 ---
 st.sidebar.title("🏠 导航")
 
@@ -166,481 +268,333 @@ st.sidebar.markdown("---")
 st.sidebar.info("偏微分方程 (PDE) 教学原型")
 
 # ==========================================
-# 辅助函数: 模块 2 绘图与模拟
+# 辅助函数: 方程博物馆 (结果缓存)
 # ==========================================
 
-def simulate_laplace():
-    """使用有限差分法 (FDM) 模拟二维拉普拉斯方程 (稳态温度/电势)"""
-    N = 50
-    T = np.zeros((N, N))
-    
-    # 边界条件 (Dirichlet)
-    T[:, 0] = 0        # 左边界
-    T[:, -1] = 0       # 右边界
-    T[0, :] = 100      # 上边界
-    T[-1, :] = 0       # 下边界
-    
-    # 迭代求解 (Jacobi 迭代)
-    for _ in range(500):
-        T_new = T.copy()
-        for i in range(1, N - 1):
-            for j in range(1, N - 1):
-                T_new[i, j] = 0.25 * (T[i + 1, j] + T[i - 1, j] + T[i, j + 1] + T[i, j - 1])
-        T = T_new
-
-    # 绘图
-    fig, ax = plt.subplots(figsize=(6, 5))
-    c = ax.contourf(T, cmap='hot', levels=20)
-    fig.colorbar(c, ax=ax, label='Potential / Temperature')
-    ax.set_title('Laplace Equation (Steady State)')
-    ax.set_xlabel('X Grid')
-    ax.set_ylabel('Y Grid')
-    return fig
-
-def simulate_heat_transfer():
-    """使用显式 FDM 模拟一维热传导方程 (动态扩散)"""
-    L = 1.0  # 长度
-    T = 1.0  # 总时间
-    N = 50   # 空间网格点
-    M = 1000 # 时间步数
-    dx = L / (N - 1)
-    dt = T / M
-    alpha = 0.01  # 扩散系数
-    
-    # CFL 条件 (稳定性要求)
-    if alpha * dt / dx**2 > 0.5:
-        alpha = 0.5 * dx**2 / dt * 0.9  # 自动调整alpha确保稳定
-        
-    u = np.zeros(N)
-    u[20:30] = 100  # 初始条件：中心加热
-    
-    # 时间迭代
-    history = []
-    for _ in range(M):
-        un = u.copy()
-        for i in range(1, N - 1):
-            u[i] = un[i] + alpha * dt / dx**2 * (un[i + 1] - 2 * un[i] + un[i - 1])
-        if _ % (M // 4) == 0 or _ == M - 1:
-            history.append(u.copy())
-
-    # 绘图
-    fig, ax = plt.subplots(figsize=(7, 4))
-    for i, profile in enumerate(history):
-        time_step = int(i * M / 4) if i < len(history) - 1 else M
-        ax.plot(np.linspace(0, L, N), profile, label=f'Time Step {time_step}')
-    
-    ax.set_title('Heat Equation (1D Diffusion)')
-    ax.set_xlabel('Position (x)')
-    ax.set_ylabel('Temperature (u)')
-    ax.legend()
-    return fig
+def show_zoo_simulation(name, simulate, **params):
+    """显示方程博物馆的演示图: 按 (name, params, 代码版本) 从 RESULT_CACHE 读取, 未命中时计算并写入
 
-def simulate_wave_equation():
-    """使用 FDM 模拟一维波动方程 (弦振动快照)"""
-    L = 1.0; c = 1.0; T = 2.0; N = 100; M = 2000
-    dx = L / (N - 1); dt = T / M
-    
-    r = c * dt / dx
-    if r > 1.0: # CFL 稳定性检查
-        dt = dx / c * 0.9
-        M = int(T / dt) + 1
-        r = c * dt / dx
-
-    u = np.zeros(N)   # 当前时间层 u(i, j)
-    u_prev = np.zeros(N) # 上一时间层 u(i, j-1)
-    
-    # 初始条件: 三角形波
-    x = np.linspace(0, L, N)
-    u[45:55] = np.linspace(0, 10, 10)
-    u[50:] = u[50:][::-1] # 峰值在中间
+    simulate 为 pde_core.zoo 中的 simulate_* 函数; 缓存条目包含解数组与渲染好的 PNG,
+    命中时不再调用求解器, 也不再经过 matplotlib 渲染。
+    """
+    _, png = RESULT_CACHE.get_or_compute(name, params, lambda: render_simulation(simulate, params))
+    st.image(png)
 
-    u_prev = u.copy() # 初始速度为零
-    
-    # 时间迭代 (使用蛙跳格式)
-    history = []
-    for m in range(M):
-        u_next = np.zeros(N) # 下一时间层 u(i, j+1)
-        for i in range(1, N - 1):
-            u_next[i] = 2 * u[i] - u_prev[i] + r**2 * (u[i + 1] - 2 * u[i] + u[i - 1])
-        u_prev = u.copy()
-        u = u_next
-        if m % (M // 5) == 0:
-            history.append(u.copy())
-
-    # 绘图
-    fig, ax = plt.subplots(figsize=(7, 4))
-    for i, profile in enumerate(history):
-        ax.plot(x, profile, label=f'Time {i * dt * (M // 5):.2f}s', alpha=0.7)
-
-    ax.set_title('Wave Equation (1D String Vibration)')
-    ax.set_xlabel('Position (x)')
-    ax.set_ylabel('Displacement (u)')
-    ax.set_ylim(-10, 10)
-    ax.legend(loc='upper right')
-    return fig
+@st.cache_resource
+def start_zoo_warm_up():
+    """每个服务进程只执行一次: 在后台进程池中计算 ZOO_DEMOS 并写入 RESULT_CACHE, 立即返回 Future 列表
+
+    页面不等待预热; 预热完成前点击的按钮会加入正在进行的计算 (见 cache.warm_up)。
+    """
+    jobs = [(name, params, render_simulation, (simulate, params)) for name, (simulate, params) in ZOO_DEMOS.items()]
+    return warm_up(RESULT_CACHE, jobs, workers=min(4, os.cpu_count() or 1))
+
+# 服务进程首次执行脚本时启动预热, 之后的重跑直接取得同一组 Future
+zoo_warm_up = start_zoo_warm_up()
+n_warm = sum(f.done() for f in zoo_warm_up)
+if n_warm < len(zoo_warm_up):
+    st.sidebar.caption(f"方程博物馆预计算中: {n_warm}/{len(zoo_warm_up)}")
+
+# ==========================================
+# 辅助函数: 预计算动画 (浏览器端播放)
+# ==========================================
+
+def show_animation(name, compute, params, player, height, cached=True, **player_kwargs):
+    """一次算出全部帧并在浏览器中播放 / 拖动, 不再占用服务器计算
+
+    compute(**params) 返回帧数据 (见 pde_core.animation), 按 (name, params, 代码版本) 缓存在 RESULT_CACHE 中;
+    cached 为 False 时 (随机初始条件, 参数相同结果也不同) 每次重新计算, 不读写缓存。
+    player 把帧数据打包为自包含的 HTML 播放器, 同时提供下载。
+    """
+    if cached:
+        arrays, _ = RESULT_CACHE.get_or_compute(name, params, lambda: (compute(**params), None))
+    else:
+        arrays = compute(**params)
+    html = player(arrays, **player_kwargs)
+    components.html(html, height=height)
+    st.download_button("下载动画 (HTML)", html, file_name=f"{name}.html", mime="text/html")
 
 # ==========================================
 # 辅助函数: 一维热传导模拟
 # ==========================================
 
-def run_1d_simulation(alpha, steps, initial_cond):
-    """一维热传导方程模拟代码"""
+
+def run_1d_sweep(equation, values, initial_conds, t_end, nx=100, n_snapshots=4):
+    """一维参数扫描: 所有 (参数, 初始条件) 组合作为一个批次同时推进, 绘制各快照时刻的曲线族
+
+    equation: "heat" (values 为扩散率 α) 或 "wave" (values 为波速 c);
+    initial_conds: 初始条件名称列表, 与 values 做笛卡尔积。
+    """
+    x = np.linspace(0, 1, nx)
+    values = np.asarray(values, dtype=float)
+    u0 = np.stack([initial_condition_1d(ic, x) for ic in initial_conds])
+    # 批次顺序: 初始条件在外层, 参数在内层
+    u0 = np.repeat(u0, len(values), axis=0)
+    params = np.tile(values, len(initial_conds))
+
+    sweep = heat_1d_sweep if equation == "heat" else wave_1d_sweep
+    t_start = time.perf_counter()
+    times, snapshots, info = sweep(u0, params, t_end, n_snapshots)
+    compute_time = time.perf_counter() - t_start
+
+    symbol = "\\alpha" if equation == "heat" else "c"
+    cmap = plt.get_cmap("viridis")
+    norm = Normalize(vmin=values.min(), vmax=values.max())
+    fig, axes = plt.subplots(len(initial_conds), n_snapshots, figsize=(3 * n_snapshots, 2.6 * len(initial_conds)),
+                             sharex=True, sharey="row", squeeze=False)
+    for i, ic in enumerate(initial_conds):
+        for k in range(n_snapshots):
+            ax = axes[i, k]
+            for b in range(i * len(values), (i + 1) * len(values)):
+                ax.plot(x, snapshots[k + 1, b], color=cmap(norm(params[b])), lw=0.8)
+            ax.set_title(f"{ic.split(' ')[0]}, t = {times[k + 1]:.3g}", fontsize=9)
+    fig.colorbar(plt.cm.ScalarMappable(norm=norm, cmap=cmap), ax=axes, label=f"${symbol}$")
+    st.pyplot(fig)
+    plt.close(fig)
+    st.info(f"批次大小 {len(params)}，单次向量化推进耗时 {compute_time:.3f} s；"
+            f"各成员步数 {info['steps'].min()} ~ {info['steps'].max()} (按各自的 CFL 稳定步长)")
+
+def run_1d_simulation(alpha, steps, initial_cond, scheme="explicit", dt=None, nx=100,
+                      record_path=None, record_every=10, rtol=1e-3, renderer="chart"):
+    """一维热传导方程模拟代码
+
+    scheme: "explicit" / "crank_nicolson" / "implicit" (见 heat.HEAT_SCHEMES),
+            或 "adaptive" (自适应步长, 相对误差容限 rtol, 推进到与 steps 个显式稳定步相同的物理时间);
+    dt: 时间步长, 为 None 时取显式格式的稳定步长; nx: 空间网格数。
+    record_path: 可选的 .npy 轨迹文件, 每 record_every 步记录一帧 (见 trajectory.TrajectoryRecorder)。
+    renderer: "chart" (只把抽样后的 u 数组发给客户端的 Vega-Lite 图表) 或 "matplotlib"
+              (持久 Figure, 每帧只更新曲线数据, 见 render.LineAnimation)。
+    """
     
     # --- 模拟设置 ---
-    nx = 100  # 空间网格数
     dx = 1.0 / (nx - 1)
     
     # 自动计算满足稳定性条件的 dt
-    # 稳定性条件: gamma = alpha * dt / dx**2 <= 0.5
-    dt = 0.5 * dx**2 / alpha * 0.9 # 乘以0.9确保安全稳定
+    # 稳定性条件: gamma = alpha * dt / dx**2 <= 0.5 (隐式格式无此限制, 可独立选择 dt)
+    if dt is None:
+        dt = explicit_stable_dt(alpha, dx) # 乘以0.9确保安全稳定
+    gamma = alpha * dt / dx**2
+    if scheme == "explicit" and gamma > 0.5:
+        st.warning(f"显式格式的 γ = {gamma:.3f} > 0.5，不满足稳定性条件，数值解将发散。")
     
     x = np.linspace(0, 1, nx)
-    u = np.zeros(nx)
-    
-    # 初始化
-    if initial_cond == "高斯脉冲 (Gaussian)":
-        u = np.exp(-100 * (x - 0.5)**2)
-    elif initial_cond == "方波 (Square)":
-        u[int(0.4*nx):int(0.6*nx)] = 1.0
-    elif initial_cond == "随机 (Random)":
-        u = np.random.rand(nx) * 0.5
-        
-    # 边界条件 (Dirichlet: 两端为0)
-    u[0] = 0
-    u[-1] = 0
+    u = initial_condition_1d(initial_cond, x)
 
     st.subheader("一维热传导模拟结果 (温度曲线)")
     chart_placeholder = st.empty()
     progress_bar = st.progress(0)
     
-    for n in range(steps):
-        # FDM 核心迭代 (一维显式格式)
-        # u[1:-1] 是当前时间步的内部点
-        # u[2:] - 2*u[1:-1] + u[:-2] 是空间二阶导数的差分近似
-        gamma = alpha * dt / dx**2
-        u[1:-1] = u[1:-1] + gamma * (u[2:] - 2*u[1:-1] + u[:-2])
-        
-        # 每隔几步更新一次图表，避免卡顿
-        if n % 10 == 0:
-            fig, ax = plt.subplots(figsize=(8, 4))
-            ax.plot(x, u, color='red', label=f'Time Step: {n}')
-            ax.set_ylim(0, 1.1)
-            ax.set_xlabel('Space (x)')
-            ax.set_ylabel('Temperature (u)')
-            ax.set_title(f'1D Heat Diffusion (Alpha={alpha}, $\\gamma={gamma:.4f}$)')
-            ax.grid(True)
-            ax.legend()
-            
-            # 在 Streamlit 中渲染 Matplotlib 图
-            chart_placeholder.pyplot(fig)
-            plt.close(fig) # 释放内存
-            
-            progress_bar.progress((n + 1) / steps)
-            time.sleep(0.01) # 稍微暂停，产生动画效果
+    t_end = steps * dt
+    info = {}
+    if scheme == "adaptive":
+        # 自适应步长: 每次尝试时按新的 dt 重新分解三对角矩阵 (O(nx))
+        march = heat_1d_adaptive(u, alpha, dx, t_end, rtol=rtol, info=info)
+        plot_every = 2
+        title = f'1D Heat Diffusion (Alpha={alpha}, adaptive, rtol={rtol:g})'
+    else:
+        # 隐式格式的三对角矩阵在此处一次性分解; 临时数组在工作区中预分配
+        march = fixed_steps(make_heat_1d_stepper(nx, gamma, scheme), Workspace(u), dt, steps)
+        plot_every = 10
+        title = f'1D Heat Diffusion (Alpha={alpha}, γ={gamma:.4f})'
+    recorder = open_recorder(record_path, u.shape, steps, record_every, solver=f"heat_1d_{scheme}",
+                             nx=nx, dx=dx, dt=dt, alpha=alpha, initial_cond=initial_cond)
+    try:
+        if recorder is not None:
+            recorder.record(0, u, 0.0)
+
+        # 图只建立一次: 客户端图表的坐标轴固定, matplotlib 的静态部分缓存为背景
+        if renderer == "chart":
+            chart_spec = {
+                "mark": {"type": "line", "color": "red"},
+                "width": "container",
+                "encoding": {
+                    "x": {"field": "x", "type": "quantitative", "title": "Space (x)"},
+                    "y": {"field": "u", "type": "quantitative", "title": "Temperature (u)",
+                          "scale": {"domain": [0, 1.1], "clamp": True}},
+                },
+            }
+        elif renderer == "matplotlib":
+            animation = LineAnimation(x, (0, 1.1), title, 'Space (x)', 'Temperature (u)')
+        else:
+            raise ValueError(f"未知的渲染方式: {renderer}")
     
-    st.success("一维模拟完成！")
+        dts = []
+
+        def on_step(n, t, dt_n, u):
+            # 在求解线程中对每一步调用: 记录步长与轨迹 (u 为工作区缓冲, 只在此处读取)
+            dts.append(dt_n)
+            if recorder is not None:
+                recorder.record(n + 1, u, t)
+
+        # FDM 核心迭代在后台线程中进行
+        # 显式: u[1:-1] += gamma * (u[2:] - 2*u[1:-1] + u[:-2])
+        # 隐式/CN: 每步求解一次预分解的三对角方程组
+        # 每 plot_every 步交出一帧, 界面按 ANIMATION_FPS 取最新的一帧, 绘图慢时丢帧而不拖慢求解
+        stream = FrameStream(march, every=plot_every, on_step=on_step)
+        for n, t, u in stream.frames(fps=ANIMATION_FPS):
+            label = f'Time Step: {n}, t = {t:.4g}'
+            if renderer == "chart":
+                xs, us = decimate_minmax(x, u, CHART_MAX_POINTS)
+                chart_spec["title"] = {"text": title, "subtitle": label}
+                chart_placeholder.vega_lite_chart({"x": xs, "u": us}, chart_spec)
+            else:
+                animation.update(u, label)
+                chart_placeholder.image(animation.png())
+            progress_bar.progress(min(t / t_end, 1.0))
+        show_stream_stats(stream)
+    finally:
+        # 重新运行脚本 (控件变化) 会在动画中途中断本函数; FrameStream 退出时已停止求解线程, 记录器在此关闭
+        if recorder is not None:
+            recorder.close()
+
+    if recorder is not None:
+        st.caption(f"轨迹已记录到 {record_path} ({recorder.n_frames} 帧)")
+    if scheme == "adaptive":
+        show_step_sizes(dts, explicit_stable_dt(alpha, dx), info)
+    st.success(f"一维模拟完成！共 {len(dts)} 步，物理时间 t = {t_end:.4g}")
+
+def show_stream_stats(stream):
+    """动画结束后报告求解耗时与显示 / 丢弃的帧数"""
+    shown = stream.produced - stream.dropped
+    st.caption(f"求解耗时 {stream.compute_time:.3f} s；显示 {shown} 帧，"
+               f"跳过 {stream.dropped} 帧 (目标帧率 {ANIMATION_FPS} fps)")
+
+def session_record_path(name):
+    """当前会话私有的轨迹文件路径 (并发的用户互不覆盖); 首次调用时为会话分配编号并清理过期的会话目录"""
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+        if os.path.isdir(TRAJECTORY_DIR):
+            for entry in os.scandir(TRAJECTORY_DIR):
+                if entry.is_dir() and time.time() - entry.stat().st_mtime > TRAJECTORY_MAX_AGE:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+    return os.path.join(TRAJECTORY_DIR, st.session_state.session_id, name)
+
+def dataset_dir(name):
+    """界面输入的数据集目录名 -> DATASET_ROOT 下的路径; 绝对路径、".." 或指向根目录之外 (符号链接) 时抛出 ValueError"""
+    name = name.strip()
+    parts = name.replace("\\", "/").split("/")
+    if not name or os.path.isabs(name) or os.path.splitdrive(name)[0] or ".." in parts:
+        raise ValueError("目录名不能为空、不能是绝对路径，也不能包含 “..”")
+    root = os.path.realpath(DATASET_ROOT)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError(f"目录必须位于 {DATASET_ROOT} 之内")
+    return path
+
+def load_recorded(path):
+    """读取已记录的轨迹 (只读文件头与旁注文件, 帧在切片时才从磁盘载入); 无法读取时显示提示并返回 None"""
+    try:
+        traj = load_trajectory(path)
+    except (OSError, ValueError, KeyError) as e:
+        st.warning(f"无法读取已记录的轨迹：{e}")
+        return None
+    return traj if len(traj) else None
+
+def heatmap_frames(shape):
+    """二维温度场的热图帧生成器 (hot 颜色映射, 范围 HEATMAP_RANGE), 小网格放大到约 HEATMAP_DISPLAY_PX 像素"""
+    return HeatmapFrames(shape, *HEATMAP_RANGE, cmap='hot', scale=max(1, HEATMAP_DISPLAY_PX // max(shape)))
+
+def show_step_sizes(dts, dt_fixed, info):
+    """绘制自适应推进中接受的步长 dt 随时间的变化, 与固定步长 dt_fixed 对比, 并报告节省的步数"""
+    times = np.cumsum(dts)
+    fig, ax = plt.subplots(figsize=(8, 2.8))
+    ax.semilogy(times, dts, 'o-', ms=3, label='accepted dt')
+    ax.axhline(dt_fixed, color='gray', linestyle='--', label=f'fixed dt = {dt_fixed:.2e}')
+    ax.set_xlabel('t')
+    ax.set_ylabel('dt')
+    ax.set_title('Adaptive step sizes')
+    ax.legend()
+    st.pyplot(fig)
+    plt.close(fig)
+    n_fixed = int(np.ceil(times[-1] / dt_fixed)) if len(dts) else 0
+    st.info(f"接受 {info.get('accepted', len(dts))} 步，拒绝 {info.get('rejected', 0)} 步；"
+            f"固定步长 {dt_fixed:.2e} 需要 {n_fixed} 步"
+            + (f"，节省约 {100 * (1 - len(dts) / n_fixed):.0f}%" if n_fixed > len(dts) else ""))
 
 # ==========================================
 # 辅助函数: 二维热传导模拟 (骨架)
 # ==========================================
 
-def run_2d_simulation(N, M, alpha, initial_temp_type, boundary_type, steps):
-    """二维热传导方程模拟的骨架代码"""
+def run_2d_simulation(N, M, alpha, initial_temp_type, boundary_type, steps, scheme="explicit", dt=None,
+                      record_path=None, record_every=10, rtol=1e-3):
+    """二维热传导方程模拟代码
+
+    boundary_type: "固定温度" / "绝热" / "周期性"; scheme: "explicit" 或 "adi" (见 heat.HEAT_2D_SCHEMES),
+    或 "adaptive" (ADI + 步长倍增, 相对误差容限 rtol, 推进到与 steps 个 dt 相同的物理时间);
+    dt: 时间步长, 为 None 时取显式格式的稳定步长 (ADI 无条件稳定, 可取更大的 dt)。
+    record_path: 可选的 .npy 轨迹文件, 每 record_every 步记录一帧 (见 trajectory.TrajectoryRecorder)。
+    """
     st.subheader("二维热传导模拟结果 (Heatmap)")
+    boundary = BOUNDARY_2D[boundary_type]
     
     # 初始化网格
     dx, dy = 1.0/(N-1), 1.0/(M-1)
-    # 为满足稳定性，dt通常需要很小
-    dt = 0.9 * (dx**2 * dy**2) / (2 * alpha * (dx**2 + dy**2)) 
-    u = np.zeros((N, M))
-    
+    # 显式格式为满足稳定性，dt通常需要很小
+    dt_explicit = explicit_stable_dt_2d(alpha, dx, dy)
+    if dt is None:
+        dt = dt_explicit
     # 设置初始条件 (Initial Temp.)
-    if initial_temp_type == "中心热源":
-        u[N//2 - 5:N//2 + 5, M//2 - 5:M//2 + 5] = 100.0
-    elif initial_temp_type == "随机":
-        u[1:-1, 1:-1] = np.random.rand(N-2, M-2) * 50.0
-    # 其他初始条件...
-
-    # 设置边界条件 (Boundary Cond.) (仅在循环外初始化一次)
-    if boundary_type == "固定温度":
-        u[0, :], u[-1, :] = 0, 0
-        u[:, 0], u[:, -1] = 0, 0
-    # 绝热或周期性边界条件需要在循环内处理
-
-    # 绘图设置
-    fig, ax = plt.subplots(figsize=(8, 6))
-    norm = Normalize(vmin=0, vmax=100) # 假设最大温度为100
-    
-    heatmap_placeholder = st.empty()
-    
-    for n in range(steps):
-        u_new = u.copy()
-        
-        # FDM 核心迭代 (二维显式格式)
-        u_new[1:-1, 1:-1] = u[1:-1, 1:-1] + alpha * dt * (
-            (u[2:, 1:-1] - 2*u[1:-1, 1:-1] + u[:-2, 1:-1]) / dx**2 +
-            (u[1:-1, 2:] - 2*u[1:-1, 1:-1] + u[1:-1, :-2]) / dy**2
-        )
-        u = u_new
-        
-        # 边界条件 (需要重新应用)
-        if boundary_type == "固定温度":
-            u[0, :], u[-1, :] = 0, 0
-            u[:, 0], u[:, -1] = 0, 0
-        
-        if n % 20 == 0: # 减少绘图频率以加速
-            ax.clear()
-            im = ax.imshow(u.T, origin='lower', cmap='hot', norm=norm)
-            ax.set_title(f'Time Step: {n}')
-            if n == 0: # 首次绘制时添加颜色条
-                fig.colorbar(im, ax=ax, label='Temperature')
-            
-            heatmap_placeholder.pyplot(fig)
-            plt.close(fig)
-            time.sleep(0.01) # 模拟动画效果
-
-    st.success(f"二维模拟完成，总步数: {steps}")
-
-def simulate_poisson():
-    """使用有限差分法 (FDM) 模拟二维泊松方程 (有源电势/温度)"""
-    N = 50
-    T = np.zeros((N, N))
-    f = np.zeros((N, N))  # 源项 f(x)
-    
-    # 放置两个源/汇点
-    f[N//3, N//3] = 100    # 正源 (热源/正电荷)
-    f[2*N//3, 2*N//3] = -100 # 负源 (热汇/负电荷)
-
-    # 边界条件 (Dirichlet): 边界保持为 0
-    
-    # 迭代求解 (Jacobi 迭代)
-    for _ in range(1000):
-        T_new = T.copy()
-        for i in range(1, N - 1):
-            for j in range(1, N - 1):
-                # 泊松方程的 FDM 离散化: T_new[i, j] = 0.25 * (T[i+1, j] + ... + f[i, j] * dx^2)
-                T_new[i, j] = 0.25 * (T[i + 1, j] + T[i - 1, j] + T[i, j + 1] + T[i, j - 1] + f[i, j] * 1**2) 
-        T = T_new
-
-    # 绘图
-    fig, ax = plt.subplots(figsize=(6, 5))
-    c = ax.contourf(T, cmap='seismic', levels=20) # 使用seismic cmap来区分正负
-    fig.colorbar(c, ax=ax, label='Potential / Temperature')
-    ax.set_title('Poisson Equation (With Sources)')
-    ax.set_xlabel('X Grid')
-    ax.set_ylabel('Y Grid')
-    return fig
-
-def simulate_helmholtz():
-    """使用有限差分法 (FDM) 模拟二维亥姆霍兹方程 (稳态波场)"""
-    N = 50
-    k = 5.0  # 波数 (Wave Number)
-    
-    # 矩阵 A (离散化的亥姆霍兹算子)
-    A = np.zeros((N*N, N*N))
-    b = np.zeros(N*N) # 源项 (设置为零，求解特征波)
-    
-    # 构建矩阵 A (五点差分)
-    for i in range(N):
-        for j in range(N):
-            idx = i * N + j
-            
-            # 内部节点
-            if 0 < i < N - 1 and 0 < j < N - 1:
-                A[idx, idx] = 4 + k**2  # 中心点项 (2*Dxx + 2*Dyy + k^2)
-                
-                # 邻居点
-                A[idx, (i + 1) * N + j] = -1 # T[i+1, j]
-                A[idx, (i - 1) * N + j] = -1 # T[i-1, j]
-                A[idx, i * N + (j + 1)] = -1 # T[i, j+1]
-                A[idx, i * N + (j - 1)] = -1 # T[i, j-1]
-            
-            # 边界节点 (Dirichlet u=0)
-            else:
-                A[idx, idx] = 1.0 
-    
-    # 求解 (用于演示，我们简单设置一个初始激励并求解)
-    b[N*N // 2] = 1.0 # 在中心点设置一个点源激励
-    
-    try:
-        u_flat = np.linalg.solve(A, b)
-        u = u_flat.reshape(N, N)
-    except np.linalg.LinAlgError:
-        u = np.zeros((N, N))
-        
-    # 绘图 (展示波场振幅)
-    fig, ax = plt.subplots(figsize=(6, 5))
-    c = ax.contourf(u, cmap='plasma', levels=20)
-    fig.colorbar(c, ax=ax, label='Wave Amplitude')
-    ax.set_title(f'Helmholtz Equation (k={k:.1f})')
-    ax.set_xlabel('X Grid')
-    ax.set_ylabel('Y Grid')
-    return fig
-
-def simulate_navier_stokes_cavity():
-    """使用简化方法（方腔流）模拟纳维-斯托克斯方程 (稳态流场)"""
-    N = 41 # 网格点
-    max_iter = 500 # 迭代次数
-    rho = 1.0 # 密度
-    nu = 0.1 # 运动粘度 (用于雷诺数 Re=1/nu)
-    
-    # 初始化涡度 (omega) 和流函数 (psi)
-    omega = np.zeros((N, N))
-    psi = np.zeros((N, N))
-
-    # 迭代求解 (简化方法)
-    for _ in range(max_iter):
-        omega_new = omega.copy()
-        
-        # 1. 求解涡度输运方程 (简化的时间步)
-        for i in range(1, N - 1):
-            for j in range(1, N - 1):
-                # 简化离散化，演示涡度扩散
-                omega_new[i, j] = 0.25 * (omega[i+1, j] + omega[i-1, j] + omega[i, j+1] + omega[i, j-1])
-        omega = omega_new
-
-        # 2. 求解泊松方程 (用于流函数 psi)
-        for i in range(1, N - 1):
-            for j in range(1, N - 1):
-                psi[i, j] = 0.25 * (psi[i+1, j] + psi[i-1, j] + psi[i, j+1] + psi[i, j-1] + omega[i, j])
-
-        # 3. 施加边界条件 (顶部移动的盖子)
-        psi[:, 0] = 0; psi[:, N-1] = 0; psi[0, :] = 0; psi[N-1, :] = 0
-        omega[N-1, :] = (psi[N-2, :] - psi[N-1, :]) * 2 / 1**2 + 10 # 顶部移动
-        
-    # 计算速度场 (u, v) 用于绘图
-    u = np.zeros((N, N))
-    v = np.zeros((N, N))
-    for i in range(1, N - 1):
-        for j in range(1, N - 1):
-            u[i, j] = (psi[i, j+1] - psi[i, j-1]) / 2 # d(psi)/dy
-            v[i, j] = -(psi[i+1, j] - psi[i-1, j]) / 2 # -d(psi)/dx
-
-    # 绘图 (流线图)
-    Y, X = np.mgrid[0:N, 0:N]
-    fig, ax = plt.subplots(figsize=(6, 6))
-    ax.streamplot(X, Y, u, v, density=1.5, linewidth=None, color=psi, cmap='coolwarm')
-    ax.set_title(f'Navier-Stokes (Lid-Driven Cavity Flow, Re≈{1/nu})')
-    ax.set_xlabel('X')
-    ax.set_ylabel('Y')
-    return fig
-
-
-def simulate_schrodinger():
-    """使用显式 FDM 模拟一维薛定谔方程 (粒子在势阱中的演化)"""
-    N = 100 # 空间点
-    T = 0.5 # 总时间
-    dx = 1.0; dt = 0.001
-    
-    # 定义势能 V(x) (方势阱)
-    x = np.linspace(-N/2, N/2, N)
-    V = np.zeros(N)
-    V[:N//4] = 1000 # 左边界墙
-    V[3*N//4:] = 1000 # 右边界墙
-
-    # 初始波包 (高斯波包)
-    sigma = 5.0
-    k0 = 1.0
-    psi_real = np.exp(-(x / sigma)**2) * np.cos(k0 * x)
-    psi_imag = np.exp(-(x / sigma)**2) * np.sin(k0 * x)
-    
-    # 时间迭代 (使用显式差分，需要非常小的 dt)
-    for _ in range(int(T / dt)):
-        # 计算下一时间步的实部和虚部
-        psi_real_next = psi_real.copy()
-        psi_imag_next = psi_imag.copy()
-        
-        for i in range(1, N - 1):
-            Laplace_real = (psi_real[i+1] - 2*psi_real[i] + psi_real[i-1]) / dx**2
-            Laplace_imag = (psi_imag[i+1] - 2*psi_imag[i] + psi_imag[i-1]) / dx**2
-            
-            # 离散化 (简化的 Crank-Nicolson 或 Euler-Forward 形式)
-            # d(psi_real)/dt = -1 * (Laplace_imag + V * psi_imag)
-            # d(psi_imag)/dt = 1 * (Laplace_real - V * psi_real)
-            
-            # 使用 Euler-Forward (显式，不稳定但简单演示)
-            psi_real_next[i] = psi_real[i] - dt * (Laplace_imag - V[i] * psi_imag[i])
-            psi_imag_next[i] = psi_imag[i] + dt * (Laplace_real - V[i] * psi_real[i])
-
-        psi_real = psi_real_next
-        psi_imag = psi_imag_next
-        
-        # 边界条件
-        psi_real[0] = 0; psi_real[-1] = 0
-        psi_imag[0] = 0; psi_imag[-1] = 0
-        
-    # 计算最终概率密度
-    Prob_Density = psi_real**2 + psi_imag**2
-    
-    # 绘图
-    fig, ax = plt.subplots(figsize=(7, 4))
-    ax.plot(x, Prob_Density, label='Probability Density $|\Psi|^2$')
-    ax.plot(x, V * 0.05, label='Potential V(x) (Scaled)', linestyle='--') # 缩放势能 V 以便绘图
-    
-    ax.set_title('Schrödinger Equation (Particle in Potential Well)')
-    ax.set_xlabel('Position (x)')
-    ax.set_ylabel('Probability Density')
-    ax.legend()
-    return fig
-
-# ==========================================
-# 辅助函数: 模拟 AI 回答 (需替换为真实 LLM API 调用)
-# ==========================================
-def simulate_ai_response(prompt):
-    """根据用户输入，模拟一个关于 PDE 的回答"""
-    # 这是一个占位符，用于演示聊天交互
+    u = initial_condition_2d(initial_temp_type, N, M)
+
+    # 设置边界条件 (Boundary Cond.) (初始化一次, 之后每步由 step 重新施加)
+    apply_boundary_2d(u, boundary)
+    u0 = u.copy()
+
+    # 绘图设置: 颜色查找表与颜色条只准备一次, 每帧只做一次量化 + 调色板 PNG 编码 (见 render.HeatmapFrames)
+    frames = heatmap_frames(u.shape)
+    col_map, col_bar = st.columns([6, 1])
+    with col_bar:
+        st.image(colorbar_png(*HEATMAP_RANGE, cmap='hot', label='Temperature'))
+    heatmap_placeholder = col_map.empty()
     
-    if "FDM" in prompt or "有限差分" in prompt:
-        return "有限差分法（FDM）是一种通过将微分方程中的导数用代数差分近似来求解 PDE 的方法。它适用于规则网格，但处理复杂几何边界较为困难。您具体想了解 FDM 的哪种格式（如显式、隐式）？"
-    elif "PINNs" in prompt or "物理信息" in prompt:
-        return "PINNs（物理信息神经网络）是一种无需网格和大量标签数据的求解方法。它将 PDE 残差加入损失函数中，让神经网络在训练过程中遵守物理定律。它非常擅长解决反问题。您希望我提供一个 PINNs 解决反问题的例子吗？"
-    elif "Navier-Stokes" in prompt or "纳维-斯托克斯" in prompt:
-        return "纳维-斯托克斯方程是描述粘性流体动量守恒的核心方程。它是一个复杂的非线性 PDE 组，求解难度极大，传统上多采用有限体积法（FVM）进行离散化求解。"
+    # 显式: u += alpha * dt * (u_xx + u_yy); ADI: 每步沿列、行各解一批三对角方程组
+    # 双缓冲: 新时间层写入预分配的 ws.next 后交换引用
+    t_end = steps * dt
+    info = {}
+    if scheme == "adaptive":
+        march = heat_2d_adaptive(u0, alpha, dx, dy, t_end, boundary, rtol=rtol, info=info)
+        plot_every = 5
     else:
-        return "欢迎提出您关于偏微分方程、数值方法或 AI 求解的任何问题！请尽量具体地描述您想了解的概念，我会尽力为您解答。"
-
-# ==========================================
-# 辅助函数: 实际 API 调用 (使用 OpenAI SDK) (保持不变)
-# ==========================================
-def call_llm_api(prompt, api_key, base_url, model_name):
-    """使用 OpenAI SDK 执行外部 LLM API 请求"""
-    
+        march = fixed_steps(make_heat_2d_stepper(u.shape, alpha, dt, dx, dy, boundary, scheme), Workspace(u0), dt, steps)
+        plot_every = 20
+    recorder = open_recorder(record_path, u.shape, steps, record_every, solver=f"heat_2d_{scheme}",
+                             N=N, M=M, dx=dx, dy=dy, dt=dt, alpha=alpha, boundary=boundary,
+                             initial_temp_type=initial_temp_type)
     try:
-        # DeepSeek 的 system message
-        system_message = {"role": "system", "content": "你是一位精通偏微分方程（PDE）、数值分析和科学计算的专业助教。你的回答应准确、简洁、专业。"}
-        
-        # 1. 实例化 OpenAI 客户端
-        client = OpenAI(
-            api_key=api_key,
-            base_url=base_url,
-            timeout=30.0
-        )
-
-        # 构造消息列表：只有 DeepSeek 默认需要 system 消息
-        messages = [
-            {"role": "user", "content": prompt}
-        ]
-        if model_name == DEFAULT_DEEPSEEK_MODEL:
-            messages.insert(0, system_message)
-            
-        # 2. 调用 Chat Completion API
-        completion = client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            temperature=0.7,
-            stream=False
-        )
-        
-        # 3. 提取结果
-        if completion.choices:
-            return completion.choices[0].message.content
-        else:
-            return "API 响应无内容 (choices 列表为空)。"
-
-    except APIError as e:
-        return f"API 请求失败（{e.status_code} {e.code}）。请检查 Base URL, Key 或模型。\n错误详情：{e.message}"
-    except Exception as e:
-        return f"处理时发生未知错误：{e}"
+        if recorder is not None:
+            recorder.record(0, u, 0.0)
+
+        dts = []
+
+        def on_step(n, t, dt_n, u):
+            dts.append(dt_n)
+            if recorder is not None:
+                recorder.record(n + 1, u, t)
+
+        # FDM 核心迭代 (边界条件在 step 内重新应用) 在后台线程中进行, 界面按 ANIMATION_FPS 显示最新的一帧
+        stream = FrameStream(march, every=plot_every, on_step=on_step)
+        for n, t, u in stream.frames(fps=ANIMATION_FPS):
+            heatmap_placeholder.image(frames.png(u), caption=f'Time Step: {n}, t = {t:.4g}')
+        show_stream_stats(stream)
+        compute_time = stream.compute_time   # 只统计推进本身的耗时, 不含绘图
+    finally:
+        if recorder is not None:   # 同 run_1d_simulation: 中途中断时也关闭记录器
+            recorder.close()
+
+    if recorder is not None:
+        st.caption(f"轨迹已记录到 {record_path} ({recorder.n_frames} 帧)，可在下方回放")
+    if scheme == "adaptive":
+        show_step_sizes(dts, dt_explicit, info)
+    st.success(f"二维模拟完成，总步数: {len(dts)}，物理时间 t = {t_end:.4g}")
+
+    # 计算效率: 每秒墙钟时间模拟的物理时间 (不含绘图), 与显式格式对比
+    rate = t_end / max(compute_time, 1e-9)
+    if scheme == "explicit":
+        st.info(f"计算耗时 {compute_time:.3f} s，每秒模拟物理时间 {rate:.3g}")
+    else:
+        rate_explicit = measure_heat_2d_throughput(u0, alpha, dt_explicit, dx, dy, boundary, "explicit")
+        st.info(f"计算耗时 {compute_time:.3f} s，每秒模拟物理时间 {rate:.3g}"
+                f"（显式格式: {rate_explicit:.3g}，约 {rate / rate_explicit:.1f} 倍）")
 
 
 # ==========================================
@@ -723,6 +677,15 @@ elif choice == "2. 方程博物馆 (Equation Zoo) 🏛️":
     # Tab 1: 静态方程 (时间无关) (保持不变)
     # ------------------------------------------
     with tab1:
+        # 拉普拉斯/泊松方程共用的求解器选择
+        steady_solver_label = st.selectbox(
+            "拉普拉斯/泊松方程求解器",
+            list(STEADY_SOLVERS.keys()),
+            index=list(STEADY_SOLVERS.values()).index(ZOO_DEMOS["laplace"][1]["solver"]),
+            help="多重网格与 DST 给出收敛的离散解; Jacobi 为固定次数迭代 (教学对比用, 未收敛)。"
+        )
+        steady_solver = STEADY_SOLVERS[steady_solver_label]
+
         # 1. 拉普拉斯方程 (Laplace Equation)
         st.subheader("1. 拉普拉斯方程 (Laplace Equation)")
         st.latex(r"\nabla^2 u = 0") 
@@ -730,8 +693,7 @@ elif choice == "2. 方程博物馆 (Equation Zoo) 🏛️":
         
         if st.button("查看模拟 (拉普拉斯)"):
             with st.spinner("正在计算二维稳态解..."):
-                fig_laplace = simulate_laplace()
-                st.pyplot(fig_laplace)
+                show_zoo_simulation("laplace", simulate_laplace, solver=steady_solver)
         
         st.markdown("---")
 
@@ -742,8 +704,7 @@ elif choice == "2. 方程博物馆 (Equation Zoo) 🏛️":
         
         if st.button("查看模拟 (泊松方程)"):
             with st.spinner("正在计算二维有源稳态解..."):
-                fig_poisson = simulate_poisson()
-                st.pyplot(fig_poisson)
+                show_zoo_simulation("poisson", simulate_poisson, solver=steady_solver)
         
         st.markdown("---")
         
@@ -754,8 +715,7 @@ elif choice == "2. 方程博物馆 (Equation Zoo) 🏛️":
         
         if st.button("查看模拟 (亥姆霍兹方程)"):
             with st.spinner("正在计算二维稳态波场..."):
-                fig_helmholtz = simulate_helmholtz()
-                st.pyplot(fig_helmholtz)
+                show_zoo_simulation("helmholtz", simulate_helmholtz)
 
     # ------------------------------------------
     # Tab 2: 动态方程 (时间相关) (新增 NS 和薛定谔)
@@ -768,8 +728,7 @@ elif choice == "2. 方程博物馆 (Equation Zoo) 🏛️":
         
         if st.button("查看模拟 (热传导)"):
             with st.spinner("正在计算一维热扩散过程..."):
-                fig_heat = simulate_heat_transfer()
-                st.pyplot(fig_heat)
+                show_zoo_simulation("heat_transfer", simulate_heat_transfer)
 
         st.markdown("---")
 
@@ -778,10 +737,17 @@ elif choice == "2. 方程博物馆 (Equation Zoo) 🏛️":
         st.latex(r"\frac{\partial^2 u}{\partial t^2} = c^2 \nabla^2 u") 
         st.caption(r"描述: 声波、光波或弦的振动。信息以有限速度 $c$ 传播，方程属于双曲型。")
         
+        col_wv1, col_wv2 = st.columns(2)
+        with col_wv1:
+            wave_method = st.selectbox("时间格式 (波动方程)", ["蛙跳格式 (固定步长)", "自适应步长 (RK23)"])
+            wave_method = "adaptive" if wave_method.startswith("自适应") else "leapfrog"
+        with col_wv2:
+            wave_rtol = st.select_slider("相对误差容限 (自适应)", options=ADAPTIVE_RTOLS,
+                                         value=ZOO_DEMOS["wave_equation"][1]["rtol"],
+                                         disabled=wave_method != "adaptive")
         if st.button("查看模拟 (波动方程)"):
             with st.spinner("正在计算一维弦振动过程..."):
-                fig_wave = simulate_wave_equation()
-                st.pyplot(fig_wave)
+                show_zoo_simulation("wave_equation", simulate_wave_equation, method=wave_method, rtol=wave_rtol)
 
         st.markdown("---")
 
@@ -792,10 +758,17 @@ elif choice == "2. 方程博物馆 (Equation Zoo) 🏛️":
         """)
         st.caption("描述: 粘性流体的动量守恒。这是流体力学 (CFD) 的核心，求解难度极大。")
         
+        col_ns1, col_ns2 = st.columns(2)
+        with col_ns1:
+            re_ns = st.select_slider("雷诺数 Re", options=[10, 100, 400, 1000],
+                                     value=ZOO_DEMOS["navier_stokes_cavity"][1]["Re"])
+        with col_ns2:
+            n_ns = st.select_slider("网格尺寸 N (N x N)", options=[41, 65, 128],
+                                    value=ZOO_DEMOS["navier_stokes_cavity"][1]["N"])
+
         if st.button("查看模拟 (Navier-Stokes)"):
-            with st.spinner("正在计算方腔流（简易 Navier-Stokes）..."):
-                fig_ns = simulate_navier_stokes_cavity()
-                st.pyplot(fig_ns)
+            with st.spinner("正在计算方腔流（涡度-流函数 Newton 法）..."):
+                show_zoo_simulation("navier_stokes_cavity", simulate_navier_stokes_cavity, N=n_ns, Re=re_ns)
         
         st.markdown("---")
         
@@ -804,10 +777,17 @@ elif choice == "2. 方程博物馆 (Equation Zoo) 🏛️":
         st.latex(r"i\hbar \frac{\partial \Psi}{\partial t} = \hat{H} \Psi")
         st.caption(r"描述: 量子力学中，波函数 $\Psi$ 随时间演化的基本方程。")
         
-        if st.button("查看模拟 (薛定谔方程)"):
-            with st.spinner("正在计算粒子概率密度演化..."):
-                fig_schrodinger = simulate_schrodinger()
-                st.pyplot(fig_schrodinger)
+        col_qm1, col_qm2 = st.columns(2)
+        with col_qm1:
+            if st.button("查看模拟 (薛定谔方程)"):
+                with st.spinner("正在计算粒子概率密度演化..."):
+                    show_zoo_simulation("schrodinger", simulate_schrodinger)
+        with col_qm2:
+            n_states = st.slider("定态个数 k", 1, 10, ZOO_DEMOS["schrodinger_stationary"][1]["k"])
+            if st.button("查看定态 (Stationary States)"):
+                with st.spinner("正在求解哈密顿矩阵的最低本征态..."):
+                    show_zoo_simulation("schrodinger_stationary", simulate_schrodinger_stationary,
+                                        k=n_states, N=ZOO_DEMOS["schrodinger_stationary"][1]["N"])
 
 # ==========================================
 # 模块 3: 经典数值模拟 (整合 1D 和 2D)
@@ -821,7 +801,8 @@ elif choice == "3. 经典数值模拟 (FDM Demo) 💻":
     if sim_type == "1D 热传导 (Heat Equation)":
         st.header("🔥 一维热传导方程模拟")
         st.latex(r"\frac{\partial u}{\partial t} = \alpha \frac{\partial^2 u}{\partial x^2}")
-        st.markdown("本模拟通过**显式有限差分法 (FDM)** 求解。注意 $\\alpha$ 较大或步数较多时可能导致数值不稳定。")
+        st.markdown("本模拟通过**有限差分法 (FDM)** 求解。显式格式受稳定性条件 $\\gamma = \\alpha \\Delta t / \\Delta x^2 \\le 0.5$ 限制；"
+                    "隐式 / Crank-Nicolson 格式无条件稳定，可以独立选择 $\\Delta t$，用少得多的步数到达同一物理时间。")
         
         # 1D 模拟的用户控件
         col_1d_c1, col_1d_c2, col_1d_c3 = st.columns(3)
@@ -831,11 +812,92 @@ elif choice == "3. 经典数值模拟 (FDM Demo) 💻":
             steps_1d = st.slider("时间步数", 100, 1000, 500)
         with col_1d_c3:
             init_cond_1d = st.selectbox("初始条件", ["高斯脉冲 (Gaussian)", "方波 (Square)", "随机 (Random)"])
+
+        col_1d_c4, col_1d_c5, col_1d_c6 = st.columns(3)
+        with col_1d_c4:
+            scheme_1d = HEAT_1D_SCHEMES[st.selectbox("时间格式", list(HEAT_1D_SCHEMES.keys()))]
+        with col_1d_c5:
+            nx_1d = st.slider("空间网格数 nx", 50, 10000, 100, step=50)
+            renderer_1d = RENDERERS_1D[st.selectbox("动画渲染", list(RENDERERS_1D.keys()),
+                                                    help="客户端图表只发送数值数组, 最快; Matplotlib 每帧发送一张 PNG")]
+        with col_1d_c6:
+            rtol_1d = 1e-3
+            if scheme_1d == "explicit":
+                dt_1d = None
+                st.caption(f"显式格式自动取稳定步长 Δt = {explicit_stable_dt(alpha_1d, 1.0 / (nx_1d - 1)):.2e}")
+            elif scheme_1d == "adaptive":
+                dt_1d = None
+                rtol_1d = st.select_slider("相对误差容限", options=ADAPTIVE_RTOLS, value=1e-3)
+                st.caption("推进到与显式格式相同的物理时间，步长由误差估计自动调整")
+            else:
+                dt_1d = st.number_input("时间步长 $\\Delta t$", min_value=1e-6, max_value=1e-1, value=1e-3, format="%.1e")
+
+        col_1d_r1, col_1d_r2 = st.columns(2)
+        with col_1d_r1:
+            record_1d = st.checkbox("记录轨迹到磁盘 (.npy，内存映射回放)", key="record_1d")
+        with col_1d_r2:
+            record_every_1d = st.number_input("每隔 k 步记录一帧", min_value=1, max_value=1000, value=10,
+                                              disabled=not record_1d, key="record_every_1d")
+        record_path_1d = session_record_path("heat1d.npy")
             
         st.markdown("---")
         
-        if st.button("启动 1D 模拟 ▶️"):
-            run_1d_simulation(alpha_1d, steps_1d, init_cond_1d)
+        col_run_1d, col_anim_1d = st.columns(2)
+        with col_run_1d:
+            run_clicked_1d = st.button("启动 1D 模拟 ▶️")
+        with col_anim_1d:
+            anim_clicked_1d = st.button("生成可回放动画 🎞️", key="anim_1d",
+                                        help="一次算出全部帧，在浏览器中播放与拖动；相同参数直接读取磁盘缓存")
+        if run_clicked_1d:
+            run_1d_simulation(alpha_1d, steps_1d, init_cond_1d, scheme=scheme_1d, dt=dt_1d, nx=nx_1d, rtol=rtol_1d,
+                              renderer=renderer_1d, record_path=record_path_1d if record_1d else None,
+                              record_every=int(record_every_1d))
+        if anim_clicked_1d:
+            with st.spinner("正在预计算一维动画..."):
+                show_animation("animation_heat_1d", heat_1d_animation,
+                               dict(alpha=alpha_1d, steps=steps_1d, initial_cond=init_cond_1d, scheme=scheme_1d,
+                                    dt=dt_1d, nx=nx_1d, rtol=rtol_1d),
+                               line_player_html, height=400, cached=init_cond_1d != "随机 (Random)",
+                               title=f"1D Heat Diffusion (Alpha={alpha_1d})",
+                               xlabel="Space (x)")
+
+        if os.path.exists(record_path_1d):
+            with st.expander("回放已记录的轨迹 (1D)"):
+                # 只从磁盘读取所选的一帧, 不重新计算
+                traj = load_recorded(record_path_1d)
+                if traj is not None:
+                    frame_idx = st.slider("帧", 0, len(traj) - 1, len(traj) - 1, key="replay_frame_1d")
+                    xs, us = decimate_minmax(np.linspace(0, 1, traj.meta["nx"]), np.asarray(traj[frame_idx]),
+                                             CHART_MAX_POINTS)
+                    st.vega_lite_chart({"x": xs, "u": us}, {
+                        "mark": {"type": "line", "color": "red"},
+                        "width": "container",
+                        "title": f"{traj.meta['solver']}, t = {traj.times[frame_idx]:.4g}",
+                        "encoding": {
+                            "x": {"field": "x", "type": "quantitative", "title": "Space (x)"},
+                            "y": {"field": "u", "type": "quantitative", "title": "Temperature (u)",
+                                  "scale": {"domain": [0, 1.1], "clamp": True}},
+                        },
+                    })
+                    st.caption(f"{len(traj)} 帧，nx = {traj.meta['nx']}，Δt = {traj.meta['dt']:.2e}，"
+                               f"每 {traj.meta['every']} 步一帧")
+
+        with st.expander("参数扫描 (批量模拟)"):
+            st.markdown("一次推进一整批参数组合 (参数 × 初始条件)，每个成员使用各自的 CFL 稳定步长，在相同时刻输出快照。")
+            col_sw1, col_sw2, col_sw3 = st.columns(3)
+            with col_sw1:
+                sweep_eq = st.selectbox("方程", ["热传导 (α)", "波动方程 (c)"])
+                sweep_eq = "heat" if sweep_eq.startswith("热传导") else "wave"
+            with col_sw2:
+                sweep_range = st.slider("参数范围", 0.1, 2.0, (0.1, 1.0))
+                sweep_count = st.slider("参数个数", 2, 100, 50)
+            with col_sw3:
+                sweep_ics = st.multiselect("初始条件", ["高斯脉冲 (Gaussian)", "方波 (Square)", "随机 (Random)"],
+                                           default=["高斯脉冲 (Gaussian)"])
+                sweep_t = st.number_input("终止时间 t", min_value=1e-3, max_value=2.0,
+                                          value=0.05 if sweep_eq == "heat" else 0.5, format="%.3f")
+            if st.button("启动参数扫描 ▶️") and sweep_ics:
+                run_1d_sweep(sweep_eq, np.linspace(*sweep_range, sweep_count), sweep_ics, sweep_t, nx=nx_1d)
         
     elif sim_type == "2D 热传导 (Heatmap) ":
         st.header("🔥🔥 二维热传导方程模拟")
@@ -845,7 +907,7 @@ elif choice == "3. 经典数值模拟 (FDM Demo) 💻":
         # 2D 模拟的用户控件 (与您提供的结构一致)
         col_c1, col_c2, col_c3 = st.columns(3)
         with col_c1:
-            N = st.slider("网格尺寸 N (N x N)", 40, 100, 60)
+            N = st.slider("网格尺寸 N (N x N)", 40, 512, 60)
             M = N # 简化为方格
         with col_c2:
             alpha_2d = st.slider("热扩散率 $\\alpha$", 0.05, 1.0, 0.2)
@@ -856,13 +918,66 @@ elif choice == "3. 经典数值模拟 (FDM Demo) 💻":
         with col_c4:
             init_cond_2d = st.selectbox("初始温度分布", ["中心热源", "随机", "均匀"])
         with col_c5:
-            bnd_cond_2d = st.selectbox("边界条件", ["固定温度", "绝热", "周期性"])
+            bnd_cond_2d = st.selectbox("边界条件", list(BOUNDARY_2D.keys()))
+
+        col_c6, col_c7 = st.columns(2)
+        with col_c6:
+            scheme_2d = HEAT_2D_SCHEMES[st.selectbox("时间格式 (2D)", list(HEAT_2D_SCHEMES.keys()))]
+        with col_c7:
+            rtol_2d = 1e-3
+            if scheme_2d == "explicit":
+                dt_2d = None
+                st.caption(f"显式格式自动取稳定步长 Δt = {explicit_stable_dt_2d(alpha_2d, 1.0 / (N - 1), 1.0 / (M - 1)):.2e}")
+            elif scheme_2d == "adaptive":
+                dt_2d = None
+                rtol_2d = st.select_slider("相对误差容限 (2D)", options=ADAPTIVE_RTOLS, value=1e-3)
+                st.caption("推进到与显式格式相同的物理时间，步长由误差估计自动调整")
+            else:
+                dt_2d = st.number_input("时间步长 $\\Delta t$ (ADI)", min_value=1e-6, max_value=1e-1, value=5e-3, format="%.1e")
+            
+        col_r1, col_r2 = st.columns(2)
+        with col_r1:
+            record_2d = st.checkbox("记录轨迹到磁盘 (.npy，内存映射回放)", key="record_2d")
+        with col_r2:
+            record_every_2d = st.number_input("每隔 k 步记录一帧", min_value=1, max_value=1000, value=10,
+                                              disabled=not record_2d, key="record_every_2d")
+        record_path_2d = session_record_path("heat2d.npy")
             
         st.markdown("---")
         
-        # run_2d_simulation 函数骨架在整个文件中，此处为调用
-        if st.button("启动 2D 模拟 ▶️"):
-            run_2d_simulation(N, M, alpha_2d, init_cond_2d, bnd_cond_2d, steps_2d) 
+        # run_2d_simulation 函数在整个文件中，此处为调用
+        col_run_2d, col_anim_2d = st.columns(2)
+        with col_run_2d:
+            run_clicked_2d = st.button("启动 2D 模拟 ▶️")
+        with col_anim_2d:
+            anim_clicked_2d = st.button("生成可回放动画 🎞️", key="anim_2d",
+                                        help="一次算出全部帧，在浏览器中播放与拖动；相同参数直接读取磁盘缓存")
+        if run_clicked_2d:
+            run_2d_simulation(N, M, alpha_2d, init_cond_2d, bnd_cond_2d, steps_2d, scheme=scheme_2d, dt=dt_2d,
+                              record_path=record_path_2d if record_2d else None, record_every=int(record_every_2d),
+                              rtol=rtol_2d)
+        if anim_clicked_2d:
+            with st.spinner("正在预计算二维动画..."):
+                show_animation("animation_heat_2d", heat_2d_animation,
+                               dict(N=N, M=M, alpha=alpha_2d, initial_temp_type=init_cond_2d,
+                                    boundary=BOUNDARY_2D[bnd_cond_2d], steps=steps_2d, scheme=scheme_2d,
+                                    dt=dt_2d, rtol=rtol_2d, vrange=HEATMAP_RANGE),
+                               heatmap_player_html, height=HEATMAP_DISPLAY_PX + 80, cached=init_cond_2d != "随机",
+                               title=f"2D Heat Diffusion (Alpha={alpha_2d}, {scheme_2d})", label="Temperature",
+                               display_px=HEATMAP_DISPLAY_PX)
+
+        if os.path.exists(record_path_2d):
+            with st.expander("回放已记录的轨迹"):
+                # 只从磁盘读取所选的一帧, 不重新计算; 旁注文件缺失或损坏时提示而不是中断页面
+                traj = load_recorded(record_path_2d)
+                if traj is not None:
+                    frame_idx = st.slider("帧", 0, len(traj) - 1, len(traj) - 1, key="replay_frame_2d")
+                    col_map, col_bar = st.columns([6, 1])
+                    col_map.image(heatmap_frames(traj.frames.shape[1:]).png(np.asarray(traj[frame_idx])),
+                                  caption=f"{traj.meta['solver']}, t = {traj.times[frame_idx]:.4g}")
+                    col_bar.image(colorbar_png(*HEATMAP_RANGE, cmap='hot', label='Temperature'))
+                    st.caption(f"{len(traj)} 帧，网格 {traj.meta['N']}×{traj.meta['M']}，Δt = {traj.meta['dt']:.2e}，"
+                               f"每 {traj.meta['every']} 步一帧")
 
 # ==========================================
 # 模块 4: 习题与测验 (新增)
@@ -1069,6 +1184,45 @@ class DeepONet(nn.Module):
 #    - Loss: MSE( NN(P_i), U_i )
 # 这种方法在 CFD 和高维问题中非常高效。
         """, language="python")
+
+        st.markdown("### ⚙️ 生成数据集 (二维热传导)")
+        st.markdown("随机采样参数 $P = (\\alpha, c_x, c_y, w, A)$ (扩散率与高斯热源)，用 ADI 格式求解得到 $t = 0.05$ 时的温度场 $U$。"
+                    "各分块由多个进程并行计算并写入磁盘，中断后重新运行会从缺失的分块继续。"
+                    f"界面最多生成 {DATASET_UI_MAX_SAMPLES} 个样本；"
+                    "大规模数据集 (10⁴–10⁵ 个样本) 请在命令行运行 `python -m pde_core.dataset <目录> --samples 100000`。")
+        col_ds1, col_ds2, col_ds3 = st.columns(3)
+        with col_ds1:
+            ds_samples = st.number_input("样本数", min_value=16, max_value=DATASET_UI_MAX_SAMPLES, value=512, step=256)
+        with col_ds2:
+            ds_grid = st.select_slider("网格 N", options=[32, 64, 128], value=64)
+        with col_ds3:
+            ds_name = st.text_input(f"输出目录 (位于 {DATASET_ROOT}/ 下)", value=f"heat2d_{ds_grid}")
+        try:
+            ds_path = dataset_dir(ds_name)
+        except ValueError as e:
+            st.error(str(e))
+            ds_path = None
+        done_chunks, total_chunks = dataset_progress(ds_path) if ds_path else (0, 0)
+        if total_chunks:
+            st.caption(f"目录中已有 {done_chunks}/{total_chunks} 个分块")
+        if st.button("生成 / 续算数据集 ▶️", disabled=ds_path is None):
+            ds_bar = st.progress(0.0)
+            t_start = time.perf_counter()
+            try:
+                n_new = generate_dataset(ds_path, int(ds_samples), N=ds_grid, workers=DATASET_UI_WORKERS,
+                                         progress=lambda done, total: ds_bar.progress(done / total))
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                st.success(f"完成：本次计算 {n_new} 个分块，耗时 {time.perf_counter() - t_start:.1f} s")
+                params, fields = next(iter_dataset(ds_path))
+                fig, axes = plt.subplots(1, 4, figsize=(12, 3))
+                for ax, p, u in zip(axes, params, fields):
+                    ax.imshow(u.T, origin="lower", cmap="hot")
+                    ax.set_title(", ".join(f"{n}={v:.2g}" for n, v in zip(PARAM_NAMES, p[:3])), fontsize=8)
+                    ax.axis("off")
+                st.pyplot(fig)
+                plt.close(fig)
         st.markdown("---")
         st.markdown("### 🔗 参考文献与工具")
         st.markdown("* **综述论文：** [Rapid CFD Prediction Based on Machine Learning Surrogate Model in Built Environment: A Review (MDPI, 2023)](https://www.mdpi.com/2311-5521/10/8/193)")
@@ -1134,6 +1288,20 @@ elif choice == "6. 主观问题答疑 (Q&A Corner) 💬":
             else:
                 st.warning("⚠️ 请输入 Key 以启用 DeepSeek 模型。")
                 
+    with st.expander("📊 回答缓存与延迟统计 (运维)"):
+        answer_stats = ANSWER_CACHE.stats()
+        col_s1, col_s2, col_s3, col_s4 = st.columns(4)
+        col_s1.metric("命中 (精确 / 近似)", f"{answer_stats['hits']} / {answer_stats['near_hits']}")
+        col_s2.metric("未命中", answer_stats["misses"])
+        col_s3.metric("命中率", f"{answer_stats['hit_rate']:.0%}")
+        col_s4.metric("缓存条目", answer_stats["entries"])
+        ttfts = [entry["ttft"] for entry in LATENCY_LOG if entry["ttft"] is not None]
+        if ttfts:
+            st.caption(f"本进程最近 {len(ttfts)} 次接口调用：首字延迟中位数 {np.median(ttfts):.2f} s，"
+                       f"总耗时中位数 {np.median([entry['total'] for entry in LATENCY_LOG]):.2f} s")
+        st.caption(f"有效期 {ANSWER_CACHE.ttl / 3600:g} 小时，上限 {ANSWER_CACHE.max_entries} 条，"
+                   f"近似匹配阈值 {ANSWER_CACHE.similarity:g}；命令行维护: python -m pde_core.answer_cache")
+
     st.markdown("---")
     
     # --- 聊天记录初始化和显示 ---
@@ -1154,22 +1322,33 @@ elif choice == "6. 主观问题答疑 (Q&A Corner) 💬":
         with st.chat_message("user"):
             st.markdown(prompt)
         
-        # 2. 生成 AI 响应
-        with st.spinner(f"AI 助教 正在思考中..."):
-            
-            if use_llm_api:
-                # 调用真实的 OpenAI SDK API
-                ai_response = call_llm_api(
-                    prompt, 
-                    current_api_key, 
+        # 2. 生成并显示 AI 响应 (相同或近似的问题先查回答缓存)
+        system = system_prompt(current_model_name)
+        cached = ANSWER_CACHE.get(current_model_name, system, prompt) if use_llm_api else None
+        with st.chat_message("assistant"):
+            if cached is not None:
+                ai_response = cached.answer
+                st.markdown(ai_response)
+                st.caption("来自回答缓存" + (f"（相似问题：{cached.prompt}，相似度 {cached.similarity:.0%}）"
+                                             if cached.similarity < 1 else ""))
+            elif use_llm_api:
+                # 调用真实的 OpenAI SDK API: 回答逐段流式写入气泡 (客户端按 Base URL + Key 在进程内复用)
+                stats = {}
+                ai_response = st.write_stream(stream_llm_api(
+                    prompt,
+                    current_api_key,
                     current_base_url,
-                    current_model_name
-                )
+                    current_model_name,
+                    stats
+                ))
+                if stats["ttft"] is not None:
+                    st.caption(f"首字延迟 {stats['ttft']:.2f} s，总耗时 {stats['total']:.2f} s")
+                if stats["error"] is None and stats["chars"]:   # 错误说明不写入缓存
+                    ANSWER_CACHE.put(current_model_name, system, prompt, ai_response)
             else:
                 # 离线模拟模式
                 ai_response = simulate_ai_response(prompt)
-                
-        # 3. 记录并显示 AI 消息
+                st.markdown(ai_response)
+
+        # 3. 记录 AI 消息
         st.session_state.messages.append({"role": "assistant", "content": ai_response})
-        with st.chat_message("assistant"):
-            st.markdown(ai_response)
@@ -0,0 +1,49 @@
+"""回答缓存的近似匹配: 增删客套字命中, 改变含义的差异不命中"""
+import pytest
+
+from pde_core.answer_cache import AnswerCache, changes_meaning, normalize_prompt
+
+QUESTION = "请问一维热传导方程的显式有限差分格式在什么条件下是数值稳定的？"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnswerCache(str(tmp_path / "answers.sqlite3"), similarity=0.7)
+
+
+def test_added_prefix_is_near_hit(cache):
+    cache.put("m", "s", "什么是有限差分算法？", "FDM")
+    hit = cache.get("m", "s", "请问什么是有限差分算法")
+    assert hit is not None and hit.answer == "FDM"
+    assert 0.7 <= hit.similarity < 1.0
+    assert cache.stats()["near_hits"] == 1
+
+
+def test_added_particle_is_near_hit(cache):
+    cache.put("m", "s", QUESTION, "EXPLICIT")
+    hit = cache.get("m", "s", QUESTION.replace("稳定的", "稳定的呢"))
+    assert hit is not None and hit.answer == "EXPLICIT"
+
+
+def test_explicit_implicit_swap_is_miss(cache):
+    cache.put("m", "s", QUESTION, "EXPLICIT")
+    assert cache.get("m", "s", QUESTION.replace("显式", "隐式")) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_added_negation_is_miss(cache):
+    cache.put("m", "s", "Crank-Nicolson格式是无条件稳定的吗", "CN")
+    assert cache.get("m", "s", "Crank-Nicolson格式不是无条件稳定的吗") is None
+
+
+def test_changes_meaning():
+    assert not changes_meaning("什么是有限差分算法", "请问什么是有限差分算法")
+    assert changes_meaning("一维热传导", "二维热传导")
+    assert changes_meaning(normalize_prompt("u_t = u_xx"), normalize_prompt("u_t = u_xx + f"))
+
+
+def test_near_matching_off_by_default(tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.sqlite3"))
+    cache.put("m", "s", "什么是有限差分算法", "FDM")
+    assert cache.get("m", "s", "请问什么是有限差分算法") is None
+    assert cache.get("m", "s", "什么是有限差分算法？").answer == "FDM"
@@ -0,0 +1,50 @@
+"""经本地模拟服务 (llm_mock.MockLLMServer) 的流式调用: 逐段到达、延迟记录、客户端与连接复用"""
+import time
+
+import pytest
+
+pytest.importorskip("openai")
+
+from pde_core import llm
+from pde_core.llm_mock import MockLLMServer
+
+PROMPT = "什么是有限差分算法？"
+TOKEN_DELAY = 0.02
+
+
+@pytest.fixture
+def server():
+    server = MockLLMServer(token_delay=TOKEN_DELAY, first_token_delay=0.05).start()
+    yield server
+    server.stop()
+
+
+def test_stream_through_pooled_client(server):
+    expected = llm.simulate_ai_response(PROMPT)
+    client = llm.get_client("mock-key", server.base_url)
+    log_start = len(llm.LATENCY_LOG)
+
+    for _ in range(2):
+        stats, arrivals, pieces = {}, [], []
+        t_start = time.perf_counter()
+        for piece in llm.stream_llm_api(PROMPT, "mock-key", server.base_url, "mock-model", stats):
+            arrivals.append(time.perf_counter() - t_start)
+            pieces.append(piece)
+
+        assert stats["error"] is None
+        assert "".join(pieces) == expected
+        # 逐段到达: 多个片段, 首段远早于最后一段 (服务端每段之间等待 TOKEN_DELAY)
+        assert len(pieces) > 5
+        assert arrivals[-1] - arrivals[0] >= (len(pieces) - 1) * TOKEN_DELAY * 0.5
+        assert 0 < stats["ttft"] <= arrivals[0] + 0.01
+        assert stats["ttft"] < stats["total"]
+        assert stats["chars"] == len(expected)
+
+    entries = list(llm.LATENCY_LOG)[log_start:]
+    assert len(entries) == 2
+    assert all(e["ttft"] is not None and e["total"] >= e["ttft"] for e in entries)
+    # 同一 (base_url, key) 复用同一个客户端, 两次提问共用一个 TCP 连接
+    assert llm.get_client("mock-key", server.base_url) is client
+    assert llm.get_client("other-key", server.base_url) is not client
+    assert server.requests == 2
+    assert server.connections == 1
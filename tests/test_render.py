@@ -0,0 +1,20 @@
+"""颜色量化: 与 Normalize + Colormap 的索引一致, 非有限值取固定索引且不产生警告"""
+import warnings
+
+import numpy as np
+
+from pde_core.render import HeatmapFrames, quantize
+
+
+def test_quantize_matches_normalize():
+    u = np.array([-5.0, 0.0, 49.9, 50.0, 99.99, 100.0, 150.0])
+    assert quantize(u, 0.0, 100.0).tolist() == [0, 0, 127, 128, 255, 255, 255]
+
+
+def test_quantize_non_finite():
+    u = np.array([np.nan, np.inf, -np.inf, 50.0])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert quantize(u, 0.0, 100.0).tolist() == [0, 255, 0, 128]
+        frames = HeatmapFrames((2, 2), 0.0, 100.0)
+        assert frames.indices(u.reshape(2, 2)).max() == 255